@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 from datetime import timedelta
+
+from repoze.lru import LRUCache
+
 from openprocurement.auctions.core.adapters import AuctionConfigurator, AuctionManagerAdapter
 from openprocurement.auctions.lease.models import (
     propertyLease,
@@ -9,7 +12,6 @@ from openprocurement.auctions.core.plugins.awarding.v2_1.adapters import (
 )
 from openprocurement.auctions.core.utils import (
     TZ,
-    calculate_business_date,
     generate_rectificationPeriod_tender_period_margin,
     get_now,
     get_request_from_root,
@@ -17,7 +19,9 @@ from openprocurement.auctions.core.utils import (
 from openprocurement.api.utils import (
     set_specific_hour,
 )
-from .constants import MANDATORY_ADDITIONAL_CLASSIFICATOR
+from .constants import AUCTION_PERIODS_CACHE_SIZE
+from .utils import append_additional_classificator
+from .working_days import calculate_business_date
 
 
 class AuctionLeaseConfigurator(AuctionConfigurator, AwardingV2_1ConfiguratorMixin):
@@ -25,16 +29,60 @@ class AuctionLeaseConfigurator(AuctionConfigurator, AwardingV2_1ConfiguratorMixi
     model = propertyLease
 
 
+class AuctionPeriodsPlan(object):
+    """Period boundaries derived from an auction start date."""
+
+    def __init__(self, start_date, auction):
+        pause_between_periods = start_date - (set_specific_hour(start_date, hour=20) - timedelta(days=1))
+        self.end_date = calculate_business_date(start_date, -pause_between_periods, auction)
+        self.three_workingDays_before_startDate = calculate_business_date(
+            start_date, -timedelta(days=3), auction, working_days=True, specific_hour=20
+        )
+        self._rectification_ends = {}
+
+    def rectification_period(self, auction):
+        """generate_rectificationPeriod_tender_period_margin for a new auction.
+
+        The helper reads the tender period end, the acceleration of
+        procurementMethodDetails and the current time, which only matters
+        once the end it computes has passed. The computed end is kept for
+        the other two and handed back to the helper while it is in the
+        future, so the business date calculation is skipped.
+        """
+        key = (auction.tenderPeriod.endDate, auction.procurementMethodDetails)
+        end_date = self._rectification_ends.get(key)
+        if end_date is not None and end_date > get_now():
+            auction.rectificationPeriod = type(auction).rectificationPeriod.model_class()
+            auction.rectificationPeriod.endDate = end_date
+        period = generate_rectificationPeriod_tender_period_margin(auction)
+        if period.endDate > get_now():
+            self._rectification_ends[key] = period.endDate
+        return period
+
+
+_auction_periods_plans = LRUCache(AUCTION_PERIODS_CACHE_SIZE)
+
+
+def get_auction_periods_plan(start_date, auction):
+    """Plan the periods once per (start date, sandbox acceleration)."""
+    key = (start_date, auction.procurementMethodDetails)
+    plan = _auction_periods_plans.get(key)
+    if plan is None:
+        plan = AuctionPeriodsPlan(start_date, auction)
+        _auction_periods_plans.put(key, plan)
+    return plan
+
+
 class AuctionLeaseManagerAdapter(AuctionManagerAdapter):
 
     def create_auction(self, request):
         auction = request.validated['auction']
         now = get_now()
         start_date = TZ.localize(auction.auctionPeriod.startDate.replace(tzinfo=None))
-        pause_between_periods = start_date - (set_specific_hour(start_date, hour=20) - timedelta(days=1))
-        end_date = calculate_business_date(start_date, -pause_between_periods, auction)
+        plan = get_auction_periods_plan(start_date, auction)
+        end_date = plan.end_date
         if auction.tenderPeriod and auction.tenderPeriod.endDate:
-            three_workingDays_before_startDate = calculate_business_date(start_date, -timedelta(days=3), auction, working_days=True, specific_hour=20)
+            three_workingDays_before_startDate = plan.three_workingDays_before_startDate
             if auction.tenderPeriod.endDate.date() != three_workingDays_before_startDate.date():
                 request.errors.add('body', 'data', 'The only possible value for tenderPeriod.endDate is {}'.format(three_workingDays_before_startDate))
                 request.errors.status = 422
@@ -48,21 +96,14 @@ class AuctionLeaseManagerAdapter(AuctionManagerAdapter):
             auction.enquiryPeriod = type(auction).enquiryPeriod.model_class()
         auction.enquiryPeriod.endDate = end_date
         if not auction.rectificationPeriod:
-            auction.rectificationPeriod = generate_rectificationPeriod_tender_period_margin(auction)
+            auction.rectificationPeriod = plan.rectification_period(auction)
         auction.tenderPeriod.startDate = auction.enquiryPeriod.startDate = auction.rectificationPeriod.startDate = auction.date = now
         auction.auctionPeriod.startDate = None
         auction.auctionPeriod.endDate = None
         if auction.lots:
             for lot in auction.lots:
                 lot.date = now
-
-        mandatory_additional_classificator = type(auction).items.model_class.additionalClassifications.model_class(MANDATORY_ADDITIONAL_CLASSIFICATOR)
-        for item in auction['items']:
-            for additionalClassification in item['additionalClassifications']:
-                if (additionalClassification['scheme'] == u'CPVS' and additionalClassification['id'] == u'PA01-7'):
-                    break
-            else:
-                item['additionalClassifications'].append(mandatory_additional_classificator)
+        append_additional_classificator(auction)
 
     def change_auction(self, request):
         pass
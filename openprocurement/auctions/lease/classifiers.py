@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import os
+from bisect import bisect_left
+from functools import partial
+from json import load
+
+
+def read_json(name):
+    with open(os.path.join(os.path.dirname(__file__), name)) as json_file:
+        return load(json_file)
+
+
+class ClassifierIndex(object):
+    """Codes of a classifier, loaded on first use.
+
+    Membership is a frozenset lookup and codes sharing a prefix (a branch
+    of the classifier hierarchy) are found by bisection of the sorted codes.
+    ``choices`` keeps the codes as loaded, None when the loader has none.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._choices = None
+        self._codes = None
+        self._sorted = None
+
+    @property
+    def choices(self):
+        if self._codes is None:
+            self._choices = self._loader()
+            self._codes = frozenset(self._choices or ())
+        return self._choices
+
+    @property
+    def codes(self):
+        if self._codes is None:
+            self.choices
+        return self._codes
+
+    def __contains__(self, code):
+        return code in self.codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def startswith(self, prefix):
+        """Return the sorted codes starting with ``prefix``."""
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self.codes))
+        codes = self._sorted
+        start = index = bisect_left(codes, prefix)
+        while index < len(codes) and codes[index].startswith(prefix):
+            index += 1
+        return codes[start:index]
+
+    def match(self, pattern):
+        """Whether a code matches ``pattern``, e.g. ``04121000-2`` or ``0412*``."""
+        if pattern.endswith('*'):
+            return bool(self.startswith(pattern[:-1]))
+        return pattern in self.codes
+
+
+CAV_PS_CODES = ClassifierIndex(partial(read_json, 'cav_ps.json'))
+CPVS_CODES = ClassifierIndex(partial(read_json, 'cpvs.json'))
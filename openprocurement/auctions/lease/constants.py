@@ -23,6 +23,35 @@ VIEW_LOCATIONS = [
     "openprocurement.auctions.lease.views",
 ]
 
+# time windows of the planning view
+PLANNING_WINDOW = timedelta(days=1)
+PLANNING_MAX_WINDOW = timedelta(days=31)
+# default and largest number of planned events on a page
+PLANNING_PAGE_SIZE = 2 ** 9
+
+# number of auction start dates with memoized period boundaries
+AUCTION_PERIODS_CACHE_SIZE = 2 ** 9
+
+# number of memoized auctionPeriod.shouldStartAfter computations
+SHOULD_START_AFTER_CACHE_SIZE = 2 ** 12
+
+# number of distinct lease terms with memoized payment schedules
+LEASE_SCHEDULE_CACHE_SIZE = 2 ** 10
+
+# number of memoized (lease terms, discount rate) present value factors
+PRESENT_VALUE_CACHE_SIZE = 2 ** 10
+
+# complaint statuses moved on by check_complaint_status on chronograph ticks,
+# the first ones after their stand-still deadlines
+DEADLINE_COMPLAINT_STATUSES = ('claim', 'answered')
+CHECKED_COMPLAINT_STATUSES = DEADLINE_COMPLAINT_STATUSES + ('pending',)
+
+# auction statuses only the Administrator may update
+TERMINAL_AUCTION_STATUSES = ('complete', 'unsuccessful', 'cancelled')
+
+# bid statuses removed when the tender period is over
+PRUNED_BID_STATUSES = ('draft', 'invalid')
+
 MANDATORY_ADDITIONAL_CLASSIFICATOR = {'scheme': u'CPVS', 'id': u'PA01-7', 'description': u'Оренда'}
 
 DEFAULT_LEVEL_OF_ACCREDITATION = {'create': [1],
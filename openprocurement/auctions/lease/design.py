@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from couchdb.design import ViewDefinition
+
+from openprocurement.api import design
+
+
+def add_design():
+    for i, j in globals().items():
+        if "_view" in i:
+            setattr(design, i, j)
+
+
+# CouchDB keeps view indexes up to date incrementally from every write
+# (save_auction, migrations, bulk updates), so the chronograph can ask for the
+# auctions that are due in a time window instead of scanning all documents.
+lease_auctions_by_next_check_view = ViewDefinition('lease_auctions', 'by_next_check', '''function(doc) {
+    if(doc.doc_type == 'Auction' && doc.next_check) {
+        emit([doc.procurementMethodType, doc.next_check], null);
+    }
+}''')
+
+lease_auctions_by_procurementMethodType_view = ViewDefinition('lease_auctions', 'by_procurementMethodType', '''function(doc) {
+    if(doc.doc_type == 'Auction') {
+        emit(doc.procurementMethodType, null);
+    }
+}''')
+
+# Upcoming events of an auction for capacity planning, see
+# iter_auctions_planned_events. Values carry the event name, the auction
+# status and the lot or award the event belongs to.
+lease_auctions_by_planned_event_view = ViewDefinition('lease_auctions', 'by_planned_event', '''function(doc) {
+    if(doc.doc_type != 'Auction') {
+        return;
+    }
+    var pmt = doc.procurementMethodType;
+    if(doc.next_check) {
+        emit([pmt, doc.next_check], ['next_check', doc.status, null]);
+    }
+    if(doc.status == 'active.tendering' && doc.tenderPeriod && doc.tenderPeriod.endDate) {
+        emit([pmt, doc.tenderPeriod.endDate], ['tenderPeriod.endDate', doc.status, null]);
+    }
+    if(doc.status == 'active.tendering' || doc.status == 'active.auction') {
+        if(doc.auctionPeriod && doc.auctionPeriod.shouldStartAfter && !doc.auctionPeriod.endDate) {
+            emit([pmt, doc.auctionPeriod.shouldStartAfter], ['auctionPeriod.shouldStartAfter', doc.status, null]);
+        }
+        (doc.lots || []).forEach(function(lot) {
+            if(lot.auctionPeriod && lot.auctionPeriod.shouldStartAfter && !lot.auctionPeriod.endDate) {
+                emit([pmt, lot.auctionPeriod.shouldStartAfter], ['auctionPeriod.shouldStartAfter', doc.status, lot.id]);
+            }
+        });
+    }
+    if(doc.status == 'active.qualification' || doc.status == 'active.awarded') {
+        (doc.awards || []).forEach(function(award) {
+            if(award.complaintPeriod && award.complaintPeriod.endDate) {
+                emit([pmt, award.complaintPeriod.endDate], ['award.complaintPeriod.endDate', doc.status, award.id]);
+            }
+        });
+    }
+}''')
@@ -20,6 +20,7 @@ from openprocurement.auctions.lease.adapters import (
     AuctionLeaseConfigurator,
     AuctionLeaseManagerAdapter
 )
+from openprocurement.auctions.lease.design import add_design
 from openprocurement.auctions.lease.constants import (
     DEFAULT_LEVEL_OF_ACCREDITATION,
     DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE,
@@ -29,6 +30,9 @@ from openprocurement.auctions.lease.models import (
     Auction,
     ILeaseAuction,
 )
+from openprocurement.auctions.lease.working_days import (
+    init_working_days_calendar
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,6 +47,12 @@ def includeme_lease(config, plugin_map):
         config.add_auction_procurementMethodType(Auction,
                                                  procurementMethodType)
 
+    # add couchdb views
+    add_design()
+
+    # index working days once for business date calculations
+    init_working_days_calendar()
+
     # add views
     for view_location in VIEW_LOCATIONS:
         config.scan(view_location)
@@ -63,6 +73,10 @@ def includeme_lease(config, plugin_map):
         (ILeaseAuction, ),
         IAuctionManager
     )
+    # run the data migration in the background of serving processes,
+    # see openprocurement.auctions.lease.migration.OnlineMigration
+    config.registry.lease_online_migration = bool(plugin_map.get('online_migration'))
+
     # migrate data
     if plugin_map['migration'] and not os.environ.get('MIGRATION_SKIP'):
         get_evenly_plugins(config, plugin_map['plugins'], 'openprocurement.auctions.lease.plugins')
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from operator import itemgetter
+
+from repoze.lru import LRUCache
+
+from .constants import LEASE_SCHEDULE_CACHE_SIZE, PRESENT_VALUE_CACHE_SIZE
+from .models import LeaseTerms
+
+CENT = Decimal('0.01')
+
+
+def to_decimal(value):
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def round_amount(amount):
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def duration_months(duration):
+    """Monthly periods of an ISO 8601 duration.
+
+    Days count as 30-day months and a started month is a whole period, so
+    a lease of ``P1Y15D`` pays 13 months.
+    """
+    if isinstance(duration, timedelta):
+        months, tdelta = 0, duration
+    else:
+        months, tdelta = int(duration.years) * 12 + int(duration.months), duration.tdelta
+    days = tdelta.days + bool(tdelta.seconds or tdelta.microseconds)
+    return months + -(-days // 30)
+
+
+class LeaseSchedule(object):
+    """Monthly payment periods of a lease grouped in runs of equal payments.
+
+    A run is ``(start, end, factor, fixed)``: the periods from ``start`` to
+    ``end - 1`` either pay the ``fixed`` amount of a tax holiday, or the base
+    amount multiplied by the escalation ``factor``. Tax holidays follow each
+    other from the start of the lease, escalation steps compound from the
+    start of the lease every ``escalationPeriodicity``. Runs only break on
+    escalation steps and tax holiday bounds, so amounts are computed once per
+    run and not once per period.
+    """
+
+    def __init__(self, lease_terms):
+        self.periods = periods = duration_months(lease_terms.leaseDuration)
+        holidays = []
+        start = 0
+        for holiday in lease_terms.taxHolidays or ():
+            end = min(start + duration_months(holiday.taxHolidaysDuration), periods)
+            if end > start:
+                holidays.append((start, end, round_amount(to_decimal(holiday.value.amount))))
+            start = end
+        steps = []
+        for clause in lease_terms.escalationClauses or ():
+            periodicity = duration_months(clause.escalationPeriodicity)
+            if periodicity and clause.escalationStepPercentage:
+                steps.append((periodicity, 1 + to_decimal(clause.escalationStepPercentage)))
+
+        bounds = set([0, periods])
+        for start, end, _ in holidays:
+            bounds.update((start, end))
+        for periodicity, _ in steps:
+            bounds.update(xrange(periodicity, periods, periodicity))
+        bounds = sorted(bounds)
+
+        self.runs = runs = []
+        index = 0
+        for start, end in zip(bounds, bounds[1:]):
+            while index < len(holidays) and holidays[index][1] <= start:
+                index += 1
+            if index < len(holidays):
+                runs.append((start, end, None, holidays[index][2]))
+                continue
+            factor = Decimal(1)
+            for periodicity, rate in steps:
+                factor *= rate ** (start // periodicity)
+            runs.append((start, end, factor, None))
+
+    def iter_payments(self, amount):
+        """Yield ``(start, end, payment)`` runs for the base monthly ``amount``."""
+        amount = to_decimal(amount)
+        for start, end, factor, fixed in self.runs:
+            yield start, end, fixed if factor is None else round_amount(amount * factor)
+
+    def total(self, amount):
+        """Total lease value for the base monthly ``amount``."""
+        return sum(
+            (payment * (end - start) for start, end, payment in self.iter_payments(amount)),
+            Decimal(0)
+        )
+
+    def present_value_factors(self, rate):
+        """``(a, b)`` such that the present value is ``amount * a + b``.
+
+        ``rate`` is the annual discount rate, the payment of a period is
+        discounted monthly from the start of the lease. Runs are summed as
+        geometric series, so the factors are found without walking periods.
+        """
+        discount = 1 / (1 + to_decimal(rate)) ** (Decimal(1) / 12)
+        a = b = Decimal(0)
+        for start, end, factor, fixed in self.runs:
+            if discount == 1:
+                weight = Decimal(end - start)
+            else:
+                weight = discount ** start * (1 - discount ** (end - start)) / (1 - discount)
+            if factor is None:
+                b += fixed * weight
+            else:
+                a += factor * weight
+        return a, b
+
+    def serialize(self, amount):
+        schedule = []
+        total = Decimal(0)
+        for start, end, payment in self.iter_payments(amount):
+            total += payment * (end - start)
+            schedule.append({
+                'startPeriod': start,
+                'endPeriod': end,
+                'amount': float(payment),
+                'total': float(payment * (end - start)),
+            })
+        return {
+            'amount': float(to_decimal(amount)),
+            'periods': self.periods,
+            'total': float(total),
+            'schedule': schedule,
+        }
+
+
+def get_lease_terms_key(lease_terms):
+    """What the schedule of serialized ``lease_terms`` depends on."""
+    return (
+        lease_terms['leaseDuration'],
+        tuple(
+            (holiday['taxHolidaysDuration'], str(holiday['value']['amount']))
+            for holiday in lease_terms.get('taxHolidays') or ()
+        ),
+        tuple(
+            (clause['escalationPeriodicity'], str(clause.get('escalationStepPercentage')))
+            for clause in lease_terms.get('escalationClauses') or ()
+        ),
+    )
+
+
+_lease_schedules = LRUCache(LEASE_SCHEDULE_CACHE_SIZE)
+
+
+def get_lease_schedule(lease_terms):
+    """Return the schedule of serialized ``lease_terms``, shared by equal terms."""
+    key = get_lease_terms_key(lease_terms)
+    schedule = _lease_schedules.get(key)
+    if schedule is None:
+        schedule = LeaseSchedule(LeaseTerms(lease_terms))
+        _lease_schedules.put(key, schedule)
+    return schedule
+
+
+_present_value_factors = LRUCache(PRESENT_VALUE_CACHE_SIZE)
+
+
+def get_present_value_factors(lease_terms, rate):
+    """Present value factors of serialized ``lease_terms`` at ``rate``."""
+    rate = to_decimal(rate)
+    key = (get_lease_terms_key(lease_terms), rate)
+    factors = _present_value_factors.get(key)
+    if factors is None:
+        factors = get_lease_schedule(lease_terms).present_value_factors(rate)
+        _present_value_factors.put(key, factors)
+    return factors
+
+
+def rank_bids(lease_terms, bids, rate):
+    """Return ``(present value, bid)`` pairs of ``bids``, the best first.
+
+    Every bid is a monthly amount under the same lease terms, so all bids are
+    valued with one pair of present value factors.
+    """
+    a, b = get_present_value_factors(lease_terms, rate)
+    ranked = [
+        (round_amount(to_decimal(bid['value']['amount']) * a + b), bid)
+        for bid in bids
+        if bid.get('value')
+    ]
+    ranked.sort(key=itemgetter(0), reverse=True)
+    return ranked
+
+
+def get_lease_amount(auction):
+    """Monthly amount of the winning award, or the auction value before it."""
+    for award in auction.get('awards') or ():
+        if award['status'] == 'active' and award.get('value'):
+            return award['value']['amount']
+    value = auction.get('value')
+    return value and value['amount']
+
+
+def iter_lease_totals(auctions):
+    """Yield the total lease value of serialized ``auctions``.
+
+    Auctions with equal lease terms share one schedule, so a batch over the
+    whole catalogue only expands each distinct set of terms once.
+    """
+    for auction in auctions:
+        lease_terms = (auction.get('contractTerms') or {}).get('leaseTerms')
+        amount = get_lease_amount(auction)
+        if not lease_terms or amount is None:
+            continue
+        schedule = get_lease_schedule(lease_terms)
+        yield {
+            'id': auction.get('id') or auction.get('_id'),
+            'amount': to_decimal(amount),
+            'periods': schedule.periods,
+            'total': schedule.total(amount),
+        }
@@ -1,5 +1,16 @@
 # -*- coding: utf-8 -*-
 import logging
+import os
+from datetime import timedelta
+from hashlib import md5
+from itertools import imap
+from json import dumps
+from multiprocessing import Pool
+from threading import Thread, local
+from time import sleep, time
+
+from couchdb.http import ResourceConflict
+from iso8601 import parse_date
 
 from openprocurement.auctions.core.plugins.awarding.v2_1.migration import (
     migrate_awarding_1_0_to_awarding_2_1
@@ -13,6 +24,27 @@ LOGGER = logging.getLogger(__name__)
 SCHEMA_VERSION = 1
 SCHEMA_DOC = 'openprocurement_auctions_dgf_schema'
 
+MIGRATION_WORKERS = int(os.environ.get('MIGRATION_WORKERS', 1))
+MIGRATION_PAGE_SIZE = 2 ** 10
+MIGRATION_BATCH_SIZE = 2 ** 7
+MIGRATION_CHUNK_SIZE = 2 ** 4
+# auctions per second of the online migration, next to the regular load
+MIGRATION_RATE = float(os.environ.get('MIGRATION_RATE', 10))
+MIGRATION_LOCK_TIMEOUT = timedelta(minutes=10)
+MIGRATION_POLL_INTERVAL = 60
+
+# state shared with the migration workers, which inherit it on fork
+_migration_context = {}
+# online migration of this process, see start_online_migration
+_online_migration = {}
+# set while the migration itself builds models, so they are not upgraded twice
+_lazy_upgrade = local()
+
+
+class Request(object):
+    def __init__(self, registry):
+        self.registry = registry
+
 
 def get_db_schema_version(db):
     schema_doc = db.get(SCHEMA_DOC, {"_id": SCHEMA_DOC})
@@ -22,15 +54,211 @@ def get_db_schema_version(db):
 def set_db_schema_version(db, version):
     schema_doc = db.get(SCHEMA_DOC, {"_id": SCHEMA_DOC})
     schema_doc["version"] = version
+    schema_doc.pop("checkpoint", None)
+    if version == SCHEMA_VERSION:
+        schema_doc.pop("online", None)
+        schema_doc.pop("online_since", None)
+    db.save(schema_doc)
+
+
+def get_online_migration_since(db):
+    """Start time of the online migration, None unless one was started."""
+    since = db.get(SCHEMA_DOC, {}).get("online_since")
+    return since and parse_date(since)
+
+
+def is_saved_since(auction, since):
+    """Whether ``auction`` was saved after the online migration started.
+
+    From then on every process reads not migrated auctions upgraded, so each
+    save, by the migration or by a request, stores the current schema.
+    """
+    date_modified = auction.get('dateModified')
+    return bool(date_modified) and parse_date(date_modified) >= since
+
+
+def get_migration_checkpoint(db, name):
+    """Return the ``[key, doc_id]`` of the last row saved by migration ``name``."""
+    checkpoint = db.get(SCHEMA_DOC, {}).get("checkpoint") or {}
+    if checkpoint.get("name") == name:
+        return checkpoint.get("row")
+
+
+def set_migration_checkpoint(db, name, row):
+    schema_doc = db.get(SCHEMA_DOC, {"_id": SCHEMA_DOC})
+    if row is None:
+        schema_doc.pop("checkpoint", None)
+    else:
+        schema_doc["checkpoint"] = {"name": name, "row": row}
+    if "online" in schema_doc:
+        # keep the online migration lock while making progress
+        schema_doc["online"]["until"] = (get_now() + MIGRATION_LOCK_TIMEOUT).isoformat()
     db.save(schema_doc)
 
 
-def migrate_data(registry, destination=None):
+def iter_migration_rows(db, view, checkpoint=None, **options):
+    """Yield ``(row, doc)`` pairs of ``view`` after ``checkpoint``."""
+    if checkpoint:
+        options.update(startkey=checkpoint[0], startkey_docid=checkpoint[1])
+    for i in db.iterview(view, MIGRATION_PAGE_SIZE, include_docs=True, **options):
+        if checkpoint and [i.key, i.id] == checkpoint:
+            continue
+        yield [i.key, i.id], dict(i.doc)
+
+
+def iter_procurement_method_type_rows(db, procurement_method_types, checkpoint=None):
+    """Yield ``(row, doc)`` pairs of the given procurementMethodTypes only.
+
+    Types are scanned in view key order, so the checkpoint of one scan
+    resumes the same way as with a single view.
+    """
+    for procurement_method_type in sorted(set(procurement_method_types)):
+        if checkpoint and procurement_method_type < checkpoint[0]:
+            continue
+        rows = iter_migration_rows(
+            db, 'lease_auctions/by_procurementMethodType',
+            checkpoint if checkpoint and procurement_method_type == checkpoint[0] else None,
+            startkey=procurement_method_type, endkey=procurement_method_type
+        )
+        for row in rows:
+            yield row
+
+
+def get_doc_hash(doc):
+    """Hash of the document content, regardless of its revision."""
+    return md5(dumps(
+        dict((k, v) for k, v in doc.items() if k != '_rev'), sort_keys=True, default=str
+    )).hexdigest()
+
+
+def init_migration_context(registry, procurement_method_types):
+    _migration_context.clear()
+    _migration_context.update({
+        'registry': registry,
+        'root': Root(Request(registry)),
+        'procurement_method_types': procurement_method_types,
+        'online_since': get_online_migration_since(registry.db),
+    })
+
+
+def upgrade_auction_doc(auction, procurement_method_types):
+    """Apply the document changes of ``from0to1`` to ``auction`` in place."""
+    migrate_awarding_1_0_to_awarding_2_1(auction, procurement_method_types)
+
+
+def migrate_auction_doc(item):
+    """Migrate one auction document to the current schema.
+
+    Runs in the migration workers. Returns ``(row, doc, changed, failed)``,
+    where ``doc`` is None for documents that have no model. A document is
+    changed when the content hash of its migrated form differs from the
+    stored one.
+    """
+    row, auction = item
+    registry = _migration_context['registry']
+    since = _migration_context.get('online_since')
+    _lazy_upgrade.disabled = True
+    try:
+        if since and is_saved_since(auction, since):
+            return row, None, False, False
+        original_hash = get_doc_hash(auction)
+        upgrade_auction_doc(auction, _migration_context['procurement_method_types'])
+        model = registry.auction_procurementMethodTypes.get(auction['procurementMethodType'])
+        if not model:
+            return row, None, False, False
+        auction = model(auction)
+        auction.__parent__ = _migration_context['root']
+        auction = auction.to_primitive()
+        changed = get_doc_hash(auction) != original_hash
+    except:
+        return row, None, False, True
+    finally:
+        _lazy_upgrade.disabled = False
+    return row, auction, changed, False
+
+
+def run_migration(registry, name, rows, workers=None, dry_run=False, rate=None):
+    """Migrate ``rows`` with a pool of ``workers`` processes.
+
+    Migrated documents are saved in batches and the last saved row is
+    checkpointed in the schema document, so an interrupted migration
+    resumes after it; the checkpoint is dropped once all rows are done.
+    Only changed documents are saved and get a new ``dateModified``. In
+    ``dry_run`` mode nothing is saved and the ids of the documents that
+    would change are reported instead. ``rate`` limits the number of
+    auctions migrated per second.
+    """
+    workers = MIGRATION_WORKERS if workers is None else workers
+    pool = Pool(workers) if workers > 1 else None
+    results = pool.imap(migrate_auction_doc, rows, MIGRATION_CHUNK_SIZE) if pool else imap(migrate_auction_doc, rows)
+    stats = {'processed': 0, 'changed': 0, 'unchanged': 0, 'failed': 0}
+    changed_ids = []
+    docs = []
+    started = time()
+
+    def flush(row):
+        if docs:
+            registry.db.update(docs)
+            del docs[:]
+        set_migration_checkpoint(registry.db, name, row)
+        elapsed = time() - started
+        LOGGER.info("Migration {}: processed {} auctions, {:.1f} auctions/s".format(
+            name, stats['processed'], stats['processed'] / elapsed if elapsed else 0
+        ), extra={'MESSAGE_ID': 'migrate_data_progress'})
+
+    try:
+        for row, auction, changed, failed in results:
+            stats['processed'] += 1
+            if rate:
+                delay = started + stats['processed'] / rate - time()
+                if delay > 0:
+                    sleep(delay)
+            if failed:  # pragma: no cover
+                stats['failed'] += 1
+                LOGGER.error("Failed migration of auction {} to schema 1.".format(row[1]), extra={'MESSAGE_ID': 'migrate_data_failed', 'AUCTION_ID': row[1]})
+                continue
+            if not changed:
+                stats['unchanged'] += 1
+            elif dry_run:
+                stats['changed'] += 1
+                changed_ids.append(row[1])
+            else:
+                stats['changed'] += 1
+                auction['dateModified'] = get_now().isoformat()
+                docs.append(auction)
+            if not dry_run and (len(docs) >= MIGRATION_BATCH_SIZE or stats['processed'] % MIGRATION_PAGE_SIZE == 0):
+                flush(row)
+        if not dry_run:
+            flush(None)
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+    stats['seconds'] = time() - started
+    if dry_run:
+        stats['changed_ids'] = changed_ids
+    LOGGER.info("Migration {} {}: processed {processed}, changed {changed}, unchanged {unchanged}, failed {failed} in {seconds:.1f}s".format(
+        name, 'checked' if dry_run else 'finished', **stats
+    ), extra={'MESSAGE_ID': 'migrate_data_finished'})
+    return stats
+
+
+def is_online_migration_enabled(registry):
+    """Whether the ``online_migration`` option of the lease plugin is set."""
+    return bool(getattr(registry, 'lease_online_migration', False))
+
+
+def migrate_data(registry, destination=None, dry_run=False, online=None, rate=None, workers=None):
     registry.app_meta.plugins
     plugins_config = registry.app_meta.plugins
     existing_plugins = get_plugins(plugins_config)
     if registry.app_meta.plugins and not any(existing_plugins):
         return
+    if online is None:
+        online = is_online_migration_enabled(registry) and not dry_run
+    if online:
+        start_online_migration(registry, destination)
+        return
     cur_version = get_db_schema_version(registry.db)
     if cur_version == SCHEMA_VERSION:
         return cur_version
@@ -38,39 +266,125 @@ def migrate_data(registry, destination=None):
         LOGGER.info("Migrate openprocurement auction schema from {} to {}".format(step, step + 1), extra={'MESSAGE_ID': 'migrate_data'})
         migration_func = globals().get('from{}to{}'.format(step, step + 1))
         if migration_func:
-            migration_func(registry)
-        set_db_schema_version(registry.db, step + 1)
+            migration_func(registry, workers=workers, dry_run=dry_run, rate=rate)
+        if not dry_run:
+            set_db_schema_version(registry.db, step + 1)
 
 
-def from0to1(registry):
-    class Request(object):
-        def __init__(self, registry):
-            self.registry = registry
-
-    results = registry.db.iterview('auctions/all', 2 ** 10, include_docs=True)
-
-    request = Request(registry)
-    root = Root(request)
+def from0to1(registry, workers=None, dry_run=False, rate=None):
     procurement_method_types = get_procurement_method_types(
         registry, ['propertyLease', 'leaseFinancial']
     )
-    docs = []
-    for i in results:
-        auction = i.doc
-        migrate_awarding_1_0_to_awarding_2_1(auction, procurement_method_types)
-        model = registry.auction_procurementMethodTypes.get(auction['procurementMethodType'])
-        if model:
+    init_migration_context(registry, procurement_method_types)
+    checkpoint = None if dry_run else get_migration_checkpoint(registry.db, 'from0to1')
+    if checkpoint:
+        LOGGER.info("Resume migration from0to1 after auction {}".format(checkpoint[1]), extra={'MESSAGE_ID': 'migrate_data_resume'})
+    rows = iter_procurement_method_type_rows(registry.db, procurement_method_types, checkpoint)
+    return run_migration(registry, 'from0to1', rows, workers=workers, dry_run=dry_run, rate=rate)
+
+
+class OnlineMigration(object):
+    """Schema migration running in the background of a serving process.
+
+    Only one process runs the migration, holding a lock in the schema
+    document; the others wait for the schema version to be updated. Until
+    then auctions read from the database are upgraded lazily by
+    ``upgrade_auction_data``. The migration runs in the serving process, so
+    it never uses a pool of worker processes.
+
+    All processes share the start time of the migration, stored in the
+    schema document before any auction is upgraded. Auctions saved since
+    then are already upgraded; the others are upgraded whatever their state.
+    """
+
+    def __init__(self, registry, destination=None, rate=MIGRATION_RATE):
+        self.registry = registry
+        self.destination = destination or SCHEMA_VERSION
+        self.rate = rate
+        self.finished = get_db_schema_version(registry.db) >= self.destination
+        self.since = None if self.finished else self.mark_start()
+        self.procurement_method_types = get_procurement_method_types(
+            registry, ['propertyLease', 'leaseFinancial']
+        )
+
+    def mark_start(self):
+        """Return the start time of the migration, storing it if not set yet."""
+        db = self.registry.db
+        while True:
+            since = get_online_migration_since(db)
+            if since:
+                return since
+            schema_doc = db.get(SCHEMA_DOC, {"_id": SCHEMA_DOC})
+            schema_doc["online_since"] = get_now().isoformat()
             try:
-                auction = model(auction)
-                auction.__parent__ = root
-                auction = auction.to_primitive()
-            except: # pragma: no cover
-                LOGGER.error("Failed migration of auction {} to schema 1.".format(auction.id), extra={'MESSAGE_ID': 'migrate_data_failed', 'AUCTION_ID': auction.id})
-            else:
-                auction['dateModified'] = get_now().isoformat()
-                docs.append(auction)
-        if len(docs) >= 2 ** 7: # pragma: no cover
-            registry.db.update(docs)
-            docs = []
-    if docs:
-        registry.db.update(docs)
\ No newline at end of file
+                db.save(schema_doc)
+            except ResourceConflict:
+                continue
+            return parse_date(schema_doc["online_since"])
+
+    def claim(self):
+        """Take the migration lock unless another process holds it."""
+        db = self.registry.db
+        schema_doc = db.get(SCHEMA_DOC, {"_id": SCHEMA_DOC})
+        lock = schema_doc.get("online")
+        if lock and parse_date(lock["until"]) > get_now():
+            return False
+        schema_doc["online"] = {"until": (get_now() + MIGRATION_LOCK_TIMEOUT).isoformat()}
+        try:
+            db.save(schema_doc)
+        except ResourceConflict:
+            return False
+        return True
+
+    def run(self):
+        db = self.registry.db
+        try:
+            while get_db_schema_version(db) < self.destination:
+                if self.claim():
+                    LOGGER.info("Started online migration", extra={'MESSAGE_ID': 'migrate_data_online'})
+                    migrate_data(self.registry, self.destination, online=False, rate=self.rate, workers=1)
+                else:
+                    sleep(MIGRATION_POLL_INTERVAL)
+        except Exception:  # pragma: no cover
+            LOGGER.exception("Online migration failed", extra={'MESSAGE_ID': 'migrate_data_online_failed'})
+            return
+        self.finished = True
+
+    def upgrade(self, auction):
+        if not self.finished and auction.get('procurementMethodType') in self.procurement_method_types \
+                and not is_saved_since(auction, self.since):
+            upgrade_auction_doc(auction, self.procurement_method_types)
+
+
+def set_online_migration(migration):
+    _online_migration.clear()
+    if migration is not None:
+        _online_migration['current'] = migration
+
+
+def start_online_migration(registry, destination=None):
+    """Run the migration in a background thread (a greenlet under gevent)."""
+    migration = OnlineMigration(registry, destination)
+    set_online_migration(migration)
+    thread = Thread(target=migration.run, name='lease-online-migration')
+    thread.daemon = True
+    thread.start()
+    return migration
+
+
+def is_stored_auction_doc(data):
+    """Whether ``data`` was read from the database, not sent by a client."""
+    return '_rev' in data and data.get('doc_type') == 'Auction'
+
+
+def upgrade_auction_data(auction):
+    """Upgrade a stored auction document not yet migrated online.
+
+    Request payloads (POST data, patched copies) have no revision and are
+    never upgraded. Nothing is done once the schema version of the database
+    is the current one.
+    """
+    migration = _online_migration.get('current')
+    if migration is not None and not getattr(_lazy_upgrade, 'disabled', False) \
+            and is_stored_auction_doc(auction):
+        migration.upgrade(auction)
@@ -5,10 +5,11 @@ from decimal import Decimal
 
 from schematics.exceptions import ValidationError
 from schematics.transforms import blacklist, whitelist
-from schematics.types import StringType, IntType, BooleanType, MD5Type
+from schematics.types import BaseType, StringType, IntType, BooleanType, MD5Type
 from schematics.types.compound import ModelType
 from schematics.types.serializable import serializable
 from pyramid.security import Allow
+from repoze.lru import LRUCache
 from zope.interface import implementer
 
 from openprocurement.auctions.core.includeme import IAwardingNextCheck
@@ -45,7 +46,7 @@ from openprocurement.auctions.core.models.roles import (
 from openprocurement.auctions.core.plugins.awarding.v2_1.models import Award
 from openprocurement.auctions.core.plugins.contracting.v2_1.models import Contract
 from openprocurement.auctions.core.utils import (
-    SANDBOX_MODE, TZ, calculate_business_date, get_request_from_root, get_now,
+    SANDBOX_MODE, TZ, get_request_from_root, get_now,
     AUCTIONS_COMPLAINT_STAND_STILL_TIME as COMPLAINT_STAND_STILL_TIME
 )
 
@@ -60,31 +61,62 @@ from openprocurement.api.models.auction_models import (
      Value as BaseValue
 )
 
+from .classifiers import ClassifierIndex
 from .constants import (
     DGF_ID_REQUIRED_FROM,
     MINIMAL_EXPOSITION_PERIOD,
     MINIMAL_EXPOSITION_REQUIRED_FROM,
     MINIMAL_PERIOD_FROM_RECTIFICATION_END,
+    SHOULD_START_AFTER_CACHE_SIZE,
 )
+from .migration import upgrade_auction_data
 from .utils import get_auction_creation_date
+from .working_days import calculate_business_date
+
+
+def get_bid_validation_context(data):
+    """Return the ``(bid, auction)`` pair owning validated ``data``.
+
+    Nested bid elements (such as parameters) keep the pair on their parent
+    model, so the walk up to the auction is done once for all of their
+    fields.
+    """
+    parent = data['__parent__']
+    if isinstance(parent, BaseAuction):
+        return data, parent
+    context = getattr(parent, '_bid_validation_context', None)
+    if context is None:
+        bid = parent
+        while not isinstance(bid['__parent__'], BaseAuction):
+            bid = bid['__parent__']
+        context = (bid, bid['__parent__'])
+        parent._bid_validation_context = context
+    return context
+
+
+def bids_validation_disabled(auction):
+    """Whether bids of ``auction`` are not validated in the current request.
+
+    Bids are not validated on auction owner PATCH requests as the bids will
+    be invalidated. The decision is kept on the auction for the request.
+    """
+    request = auction.__parent__.request
+    cached = getattr(auction, '_bids_validation_disabled', None)
+    if cached is None or cached[0] is not request:
+        cached = (request, request.method == "PATCH" and request.authenticated_role == "auction_owner")
+        auction._bids_validation_disabled = cached
+    return cached[1]
 
 
 def bids_validation_wrapper(validation_func):
     def validator(klass, data, value):
-        orig_data = data
-        while not isinstance(data['__parent__'], BaseAuction):
-            # in case this validation wrapper is used for subelement of bid (such as parameters)
-            # traverse back to the bid to get possibility to check status  # troo-to-to =)
-            data = data['__parent__']
-        if data['status'] in ('invalid', 'draft'):
+        bid, auction = get_bid_validation_context(data)
+        if bid['status'] in ('invalid', 'draft'):
             # skip not valid bids
             return
-        tender = data['__parent__']
-        request = tender.__parent__.request
-        if request.method == "PATCH" and isinstance(tender, BaseAuction) and request.authenticated_role == "auction_owner":
-            # disable bids validation on tender PATCH requests as tender bids will be invalidated
+        if bids_validation_disabled(auction):
             return
-        return validation_func(klass, orig_data, value)
+        return validation_func(klass, data, value)
     return validator
 
 
@@ -93,6 +125,39 @@ class ProcuringEntity(flashProcuringEntity):
     additionalIdentifiers = ListType(ModelType(Identifier))
 
 
+class BidCounters(object):
+    """Number of bids of an auction: in total, by status and active by lot.
+
+    Bids are counted for a lot the way Lot.numberOfBids does: active bids
+    with an active lot value related to it.
+    """
+
+    def __init__(self, bids):
+        self.total = len(bids)
+        self.statuses = {}
+        self.lots = {}
+        for bid in bids:
+            status = getattr(bid, "status", "active")
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 'active':
+                lot_ids = set(
+                    lot_value.relatedLot for lot_value in getattr(bid, 'lotValues', None) or ()
+                    if getattr(lot_value, 'status', 'active') == 'active'
+                )
+                for lot_id in lot_ids:
+                    self.lots[lot_id] = self.lots.get(lot_id, 0) + 1
+
+    @property
+    def active(self):
+        return self.statuses.get('active', 0)
+
+
+def reset_bid_counters(auction):
+    """Drop the bid counters of ``auction`` after its bids were changed."""
+    if auction is not None:
+        auction._bid_counters = None
+
+
 class Bid(BaseBid):
     class Options:
         roles = {
@@ -104,6 +169,16 @@ class Bid(BaseBid):
     documents = ListType(ModelType(Document), default=list())
     qualified = BooleanType(required=True, choices=[True])
 
+    def __setattr__(self, name, value):
+        super(Bid, self).__setattr__(name, value)
+        if name in ('status', 'lotValues'):
+            reset_bid_counters(getattr(self, '__parent__', None))
+
+    def import_data(self, raw_data, **kw):
+        result = super(Bid, self).import_data(raw_data, **kw)
+        reset_bid_counters(getattr(self, '__parent__', None))
+        return result
+
     @bids_validation_wrapper
     def validate_value(self, data, value):
         BaseBid._validator_functions['value'](self, data, value)
@@ -129,6 +204,38 @@ def rounding_shouldStartAfter(start_after, auction, use_from=datetime(2016, 6, 1
     return start_after
 
 
+_should_start_after_cache = LRUCache(SHOULD_START_AFTER_CACHE_SIZE)
+
+
+def get_should_start_after_plan(auction, start_date):
+    """Return ``(auction end time, start after it, start after enquiries)``.
+
+    The date math only depends on the number of bids, the auction start date,
+    the enquiry period and the status, so it is done once per such key and
+    shared by all serializations. Which of the two dates applies depends on
+    the current time and is decided by the caller.
+    """
+    enquiry_period = auction.enquiryPeriod
+    key = (
+        auction.numberOfBids,
+        start_date,
+        enquiry_period and enquiry_period.startDate,
+        enquiry_period and enquiry_period.endDate,
+        auction.status,
+        auction.submissionMethodDetails,
+    )
+    plan = _should_start_after_cache.get(key)
+    if plan is None:
+        end_time = start_date and calc_auction_end_time(key[0], start_date)
+        plan = (
+            end_time,
+            end_time and rounding_shouldStartAfter(end_time, auction).isoformat(),
+            key[3] and rounding_shouldStartAfter(key[3], auction).isoformat(),
+        )
+        _should_start_after_cache.put(key, plan)
+    return plan
+
+
 class AuctionAuctionPeriod(Period):
     """The auction period."""
 
@@ -139,13 +246,10 @@ class AuctionAuctionPeriod(Period):
         auction = self.__parent__
         if auction.lots or auction.status not in ['active.tendering', 'active.auction']:
             return
-        if self.startDate and get_now() > calc_auction_end_time(auction.numberOfBids, self.startDate):
-            start_after = calc_auction_end_time(auction.numberOfBids, self.startDate)
-        elif auction.enquiryPeriod and auction.enquiryPeriod.endDate:
-            start_after = auction.enquiryPeriod.endDate
-        else:
-            return
-        return rounding_shouldStartAfter(start_after, auction).isoformat()
+        end_time, after_auction, after_enquiries = get_should_start_after_plan(auction, self.startDate)
+        if end_time and get_now() > end_time:
+            return after_auction
+        return after_enquiries
 
     def validate_startDate(self, data, startDate):
         auction = get_auction(data['__parent__'])
@@ -193,8 +297,24 @@ class EscalationClauses(Model):
     conditions_ru = StringType()
 
 
+# choices of the base classification id, indexed for the membership check
+BASE_CLASSIFICATION_CODES = ClassifierIndex(
+    lambda: dgfCDB2CPVCAVClassification._fields['id'].choices
+)
+
+
 class PropertyLeaseClassification(dgfCDB2CPVCAVClassification):
     scheme = StringType(required=True, choices=[u'CAV-PS', u'CPV'])
+    # the base choices are checked in validate_id through the index
+    id = StringType(required=True)
+
+    def validate_id(self, data, code):
+        choices = BASE_CLASSIFICATION_CODES.choices
+        if choices is not None and code not in BASE_CLASSIFICATION_CODES:
+            raise ValidationError(BaseType.MESSAGES['choices'].format(unicode(choices)))
+        base_validate_id = dgfCDB2CPVCAVClassification._validator_functions.get('id')
+        if base_validate_id:
+            base_validate_id(self, data, code)
 
 
 class PropertyItem(Item):
@@ -248,6 +368,12 @@ class Auction(BaseAuction):
     minNumberOfQualifiedBids = IntType(choices=[1, 2], default=2)
     contractTerms = ModelType(ContractTerms, required=True)
 
+    def __init__(self, raw_data=None, *args, **kwargs):
+        if isinstance(raw_data, dict):
+            # stored documents not yet reached by the online migration
+            upgrade_auction_data(raw_data)
+        super(Auction, self).__init__(raw_data, *args, **kwargs)
+
     def __acl__(self):
         return [
             (Allow, '{}_{}'.format(self.owner, self.owner_token), 'edit_auction'),
@@ -258,6 +384,33 @@ class Auction(BaseAuction):
     def initialize(self): # TODO: get rid of this method
         pass
 
+    # set by utils.collect_auction while the auction is saved in bulk
+    bulk_docs_collector = None
+
+    def store(self, db, *args, **kwargs):
+        return super(Auction, self).store(self.bulk_docs_collector or db, *args, **kwargs)
+
+    @property
+    def bid_counters(self):
+        """Bid counters, kept until the bids are changed.
+
+        Appending or removing bids, or replacing the list (import of patches),
+        is noticed from the list itself. Status and lotValues changes of a bid
+        (attribute or item assignment, import_data) reset the counters
+        through reset_bid_counters.
+        """
+        bids = self.bids
+        cached = getattr(self, '_bid_counters', None)
+        if cached is None or cached[0] is not bids or cached[1] != len(bids):
+            cached = (bids, len(bids), BidCounters(bids))
+            self._bid_counters = cached
+        return cached[2]
+
+    @serializable
+    def numberOfBids(self):
+        """A property that is serialized by schematics exports."""
+        return self.bid_counters.total
+
     def validate_tenderPeriod(self, data, period):
         if not (period and period.startDate and period.endDate):
             return
@@ -281,33 +434,96 @@ class Auction(BaseAuction):
             if get_auction_creation_date(data) > DGF_ID_REQUIRED_FROM:
                 raise ValidationError(u'This field is required.')
 
+    def _next_check_key(self):
+        """Cheap fingerprint of everything next_check depends on.
+
+        Any mutation of the auction that could move next_check changes the
+        key, so a memoized value is dropped as soon as the model is changed.
+        Like the calculation it is linear in the size of the auction, but it
+        only reads attributes while the calculation does business day
+        arithmetic for every complaint.
+        """
+        def complaint_key(complaint):
+            return (complaint.status, complaint.dateSubmitted, complaint.dateAnswered)
+
+        def period_key(period):
+            return period and (period.startDate, period.endDate)
+
+        return (
+            self.status,
+            self.procurementMethodDetails,
+            self.numberOfBids,
+            period_key(self.tenderPeriod),
+            period_key(self.auctionPeriod),
+            period_key(self.awardPeriod),
+            tuple(
+                (lot.id, lot.status, lot.numberOfBids, period_key(lot.auctionPeriod))
+                for lot in self.lots
+            ),
+            tuple(complaint_key(complaint) for complaint in self.complaints),
+            tuple(
+                (award.id, award.status,
+                 period_key(getattr(award, 'complaintPeriod', None)),
+                 period_key(getattr(award, 'verificationPeriod', None)),
+                 period_key(getattr(award, 'paymentPeriod', None)),
+                 period_key(getattr(award, 'signingPeriod', None)),
+                 tuple(complaint_key(complaint) for complaint in award.complaints))
+                for award in self.awards
+            ),
+            tuple((contract.id, contract.status) for contract in self.contracts),
+        )
+
     @serializable(serialize_when_none=False)
     def next_check(self):
+        # The same auction is serialized several times per request (role view,
+        # auction_view, status role, save), so the result is memoized for the
+        # current request until the model is mutated or the time reaches an
+        # auction start or end the result was clamped to.
+        request = get_request_from_root(self)
+        if request is None:
+            return self._calculate_next_check(request)[0]
+        key = self._next_check_key()
+        cached = getattr(self, '_next_check_cache', None)
+        if cached is not None and cached[0] is request and cached[1] == key and \
+                (cached[3] is None or get_now() < cached[3]):
+            return cached[2]
+        next_check, expires = self._calculate_next_check(request)
+        self._next_check_cache = (request, key, next_check, expires)
+        return next_check
+
+    def _calculate_next_check(self, request):
+        """next_check and the time until which it does not depend on now."""
         now = get_now()
         checks = []
+        # auction periods are checked against now, the result is valid until
+        # the earliest of the times they were compared with
+        clamps = []
         if self.status == 'active.tendering' and self.tenderPeriod and self.tenderPeriod.endDate:
             checks.append(self.tenderPeriod.endDate.astimezone(TZ))
         elif not self.lots and self.status == 'active.auction' and self.auctionPeriod and self.auctionPeriod.startDate and not self.auctionPeriod.endDate:
             if now < self.auctionPeriod.startDate:
-                checks.append(self.auctionPeriod.startDate.astimezone(TZ))
-            elif now < calc_auction_end_time(self.numberOfBids, self.auctionPeriod.startDate).astimezone(TZ):
-                checks.append(calc_auction_end_time(self.numberOfBids, self.auctionPeriod.startDate).astimezone(TZ))
+                clamps.append(self.auctionPeriod.startDate.astimezone(TZ))
+            else:
+                auction_end_time = calc_auction_end_time(self.numberOfBids, self.auctionPeriod.startDate).astimezone(TZ)
+                if now < auction_end_time:
+                    clamps.append(auction_end_time)
         elif self.lots and self.status == 'active.auction':
             for lot in self.lots:
                 if lot.status != 'active' or not lot.auctionPeriod or not lot.auctionPeriod.startDate or lot.auctionPeriod.endDate:
                     continue
                 if now < lot.auctionPeriod.startDate:
-                    checks.append(lot.auctionPeriod.startDate.astimezone(TZ))
-                elif now < calc_auction_end_time(lot.numberOfBids, lot.auctionPeriod.startDate).astimezone(TZ):
-                    checks.append(calc_auction_end_time(lot.numberOfBids, lot.auctionPeriod.startDate).astimezone(TZ))
+                    clamps.append(lot.auctionPeriod.startDate.astimezone(TZ))
+                    continue
+                lot_end_time = calc_auction_end_time(lot.numberOfBids, lot.auctionPeriod.startDate).astimezone(TZ)
+                if now < lot_end_time:
+                    clamps.append(lot_end_time)
+        checks.extend(clamps)
         # Use next_check part from awarding
-        request = get_request_from_root(self)
         if request is not None:
             awarding_check = request.registry.getAdapter(self, IAwardingNextCheck).add_awarding_checks(self)
             if awarding_check is not None:
                 checks.append(awarding_check)
         if self.status.startswith('active'):
-            from openprocurement.auctions.core.utils import calculate_business_date
             for complaint in self.complaints:
                 if complaint.status == 'claim' and complaint.dateSubmitted:
                     checks.append(calculate_business_date(complaint.dateSubmitted, COMPLAINT_STAND_STILL_TIME, self))
@@ -319,7 +535,8 @@ class Auction(BaseAuction):
                         checks.append(calculate_business_date(complaint.dateSubmitted, COMPLAINT_STAND_STILL_TIME, self))
                     elif complaint.status == 'answered' and complaint.dateAnswered:
                         checks.append(calculate_business_date(complaint.dateAnswered, COMPLAINT_STAND_STILL_TIME, self))
-        return min(checks).isoformat() if checks else None
+        next_check = min(checks).isoformat() if checks else None
+        return next_check, min(clamps) if clamps else None
 
 
 propertyLease = Auction
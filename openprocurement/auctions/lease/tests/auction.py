@@ -23,6 +23,7 @@ from openprocurement.auctions.lease.tests.base import (
 from openprocurement.auctions.lease.tests.blanks.auction_blanks import (
     # AuctionAuctionResourceTest
     post_auction_auction,
+    get_bids_ranking,
     # AuctionLotAuctionResourceTest
     post_auction_auction_lot,
     # AuctionMultipleLotAuctionResourceTest
@@ -39,6 +40,7 @@ class AuctionAuctionResourceTest(BaseAuctionWebTest, AuctionAuctionResourceTestM
     initial_bids = test_bids
 
     test_post_auction_auction = snitch(post_auction_auction)
+    test_get_bids_ranking = snitch(get_bids_ranking)
 
 
 class AuctionSameValueAuctionResourceTest(BaseAuctionWebTest):
@@ -21,6 +21,7 @@ from openprocurement.auctions.lease.tests.blanks.bidder_blanks import (
     delete_auction_bidder,
     get_auction_auctioners,
     bid_Administrator_change,
+    bulk_auction_bidders,
     # AuctionBidInvalidationAuctionResourceTest
     post_auction_all_invalid_bids,
     post_auction_one_invalid_bid,
@@ -56,6 +57,7 @@ class AuctionBidderResourceTest(BaseAuctionWebTest):
     test_delete_auction_bidder = snitch(delete_auction_bidder)
     test_get_auction_auctioners = snitch(get_auction_auctioners)
     test_bid_Administrator_change = snitch(bid_Administrator_change)
+    test_bulk_auction_bidders = snitch(bulk_auction_bidders)
 
 
 class AuctionBidInvalidationAuctionResourceTest(BaseAuctionWebTest):
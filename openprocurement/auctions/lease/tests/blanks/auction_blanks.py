@@ -468,3 +468,26 @@ def reset_auction_period(self):
     self.assertGreaterEqual(item['auctionPeriod']['shouldStartAfter'], response.json['data']['tenderPeriod']['endDate'])
     self.assertIn('9999-01-01T00:00:00', item['auctionPeriod']['startDate'])
     self.assertIn('9999-01-01T00:00:00', response.json['data']['next_check'])
+
+
+def get_bids_ranking(self):
+    response = self.app.get('/auctions/{}/bids_ranking'.format(self.auction_id), status=403)
+    self.assertEqual(response.json['errors'][0]['description'],
+                     "Can't view bids in current (active.tendering) auction status")
+
+    self.set_status('active.qualification')
+    response = self.app.get('/auctions/{}/bids_ranking?rate=0.1'.format(self.auction_id))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    ranking = response.json['data']
+    self.assertEqual(set(i['id'] for i in ranking), set(b['id'] for b in self.initial_bids))
+    self.assertEqual([i['amount'] for i in ranking],
+                     sorted((b['value']['amount'] for b in self.initial_bids), reverse=True))
+
+    response = self.app.get('/auctions/{}/bids_ranking'.format(self.auction_id))
+    self.assertGreater(response.json['data'][0]['presentValue'], ranking[0]['presentValue'])
+
+    response = self.app.get('/auctions/{}/bids_ranking?rate=2'.format(self.auction_id), status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Should be a number from 0 to 1.', u'location': u'params', u'name': u'rate'}
+    ])
@@ -699,3 +699,92 @@ def create_auction_bidder_document_nopending(self):
     self.assertEqual(response.status, '403 Forbidden')
     self.assertEqual(response.content_type, 'application/json')
     self.assertEqual(response.json['errors'][0]["description"], "Can't add document because award of bid is not in pending state")
+
+
+def bulk_auction_bidders(self):
+    bid_data = {'tenderers': [self.initial_organization], "value": {"amount": 500}, 'qualified': True}
+    if self.initial_organization == test_financial_organization:
+        bid_data['eligible'] = True
+    draft_bid_data = deepcopy(bid_data)
+    draft_bid_data.update({"status": "draft", "value": {"amount": 60}})
+    invalid_bid_data = deepcopy(bid_data)
+    invalid_bid_data["value"] = {"amount": 60}
+
+    response = self.app.post_json('/auctions/{}/bids_bulk'.format(self.auction_id),
+                                  {'data': {'bids': [bid_data, invalid_bid_data]}}, status=422)
+    self.assertEqual(response.status, '422 Unprocessable Entity')
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{}, {u'value': [u'value of bid should be greater than value of auction']}],
+         u'location': u'body', u'name': u'bids'}
+    ])
+    response = self.app.get('/auctions/{}'.format(self.auction_id))
+    self.assertNotIn('bids', response.json['data'])
+
+    response = self.app.post_json('/auctions/{}/bids_bulk'.format(self.auction_id),
+                                  {'data': {'bids': [bid_data, draft_bid_data]}})
+    self.assertEqual(response.status, '201 Created')
+    self.assertEqual(response.content_type, 'application/json')
+    bids = response.json['data']
+    access = response.json['access']
+    self.assertEqual([i['status'] for i in bids], ['active', 'draft'])
+    self.assertEqual([i['id'] for i in access], [i['id'] for i in bids])
+    for bid, bid_access in zip(bids, access):
+        response = self.app.get('/auctions/{}/bids/{}?acc_token={}'.format(
+            self.auction_id, bid['id'], bid_access['token']))
+        self.assertEqual(response.json['data']['id'], bid['id'])
+
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[1]['id'], 'token': access[0]['token'], 'status': 'active'}
+    ]}}, status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[0]['id'], 'token': access[0]['token'], 'status': 'draft'},
+        {'id': bids[1]['id'], 'token': access[1]['token'], 'status': 'active'}
+    ]}}, status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{u'status': [u"Can't update bid to (draft) status"]}, {}],
+         u'location': u'body', u'name': u'bids'}
+    ])
+
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[1]['id'], 'token': access[1]['token'], 'status': 'active'}
+    ]}}, status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': [{u'value': [u'value of bid should be greater than value of auction']}],
+         u'location': u'body', u'name': u'bids'}
+    ])
+
+    response = self.app.patch_json('/auctions/{}/bids/{}?acc_token={}'.format(
+        self.auction_id, bids[1]['id'], access[1]['token']), {"data": {"value": {"amount": 500}}})
+    self.assertEqual(response.status, '200 OK')
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[1]['id'], 'token': access[1]['token'], 'status': 'active'}
+    ]}})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'][0]['status'], 'active')
+
+    authorization = self.app.authorization
+    self.app.authorization = ('Basic', ('broker1', ''))
+    response = self.app.post_json('/auctions/{}/bids_bulk'.format(self.auction_id),
+                                  {'data': {'bids': [bid_data]}}, status=403)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Broker Accreditation level does not permit bid creation',
+         u'location': u'procurementMethodType', u'name': u'accreditation'}
+    ])
+
+    self.app.authorization = ('Basic', ('broker2', ''))
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[0]['id'], 'token': access[0]['token'], 'status': 'active'}
+    ]}}, status=403)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Forbidden', u'location': u'url', u'name': u'permission'}
+    ])
+
+    self.app.authorization = ('Basic', ('administrator', ''))
+    response = self.app.patch_json('/auctions/{}/bids_bulk'.format(self.auction_id), {'data': {'bids': [
+        {'id': bids[0]['id'], 'status': 'invalid'}
+    ]}})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'][0]['status'], 'invalid')
+    self.app.authorization = authorization
@@ -1,8 +1,16 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime, timedelta
 
+import mock
+from schematics.exceptions import ModelValidationError
+
 from openprocurement.auctions.core.utils import get_now
 
+from openprocurement.auctions.lease.utils import (
+    iter_auctions_by_next_check,
+    iter_auctions_planned_events,
+)
+
 
 # AuctionSwitchQualificationResourceTest
 
@@ -28,3 +36,148 @@ def switch_to_qualification(self):
     self.assertEqual(response.content_type, 'application/json')
     self.assertEqual(response.json['data']["status"], "active.qualification")
     self.assertEqual(len(response.json['data']["awards"]), 1)
+
+
+# AuctionNextCheckIndexTest
+
+
+def next_check_index(self):
+    registry = self.app.app.registry
+    next_check = self.db.get(self.auction_id)['next_check']
+    due = list(iter_auctions_by_next_check(registry, get_now() + timedelta(days=60)))
+    self.assertIn((next_check, self.auction_id), due)
+    self.assertEqual(due, sorted(due))
+
+    due = list(iter_auctions_by_next_check(registry, get_now() - timedelta(days=1)))
+    self.assertNotIn(self.auction_id, [auction_id for _, auction_id in due])
+
+
+# AuctionSwitchAuctionBulkResourceTest
+
+
+def switch_to_auction_bulk(self):
+    self.set_status('active.auction', {'status': self.initial_status})
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id]}}, status=403)
+    self.assertEqual(response.status, '403 Forbidden')
+
+    self.app.authorization = ('Basic', ('chronograph', ''))
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': []}}, status=422)
+    self.assertEqual(response.json['errors'][0]['name'], 'ids')
+
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id, 'some_id']}})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    result, missing = response.json['data']
+    self.assertEqual(result['id'], self.auction_id)
+    self.assertTrue(result['updated'])
+    self.assertEqual(result['status'], 'active.auction')
+    self.assertEqual(missing, {
+        'id': 'some_id', 'updated': False,
+        'errors': [{'location': 'url', 'name': 'auction_id', 'description': 'Not Found'}]
+    })
+
+    auction = self.db.get(self.auction_id)
+    self.assertEqual(auction['status'], 'active.auction')
+    self.assertEqual(auction['_rev'], result['rev'])
+
+    db = self.app.app.registry.db
+    with mock.patch.object(db, 'view', wraps=db.view) as view:
+        response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id]}})
+    self.assertFalse(response.json['data'][0]['updated'])
+    view.assert_called_once_with('_all_docs', keys=[self.auction_id], include_docs=True)
+
+
+def switch_to_auction_bulk_errors(self):
+    self.app.authorization = ('Basic', ('chronograph', ''))
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id, self.auction_id]}})
+    self.assertEqual([i['id'] for i in response.json['data']], [self.auction_id])
+
+    with mock.patch('openprocurement.auctions.lease.utils.check_status',
+                    side_effect=ModelValidationError({'bids': [u'Broken bid.']})):
+        response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id]}})
+    self.assertEqual(response.json['data'], [{
+        'id': self.auction_id, 'updated': False,
+        'errors': [{'location': 'body', 'name': 'bids', 'description': [u'Broken bid.']}]
+    }])
+
+    auction = self.db.get(self.auction_id)
+    value = auction['value']
+    auction['value'] = {'amount': 'not a number', 'currency': 'UAH'}
+    self.db.save(auction)
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id]}})
+    result = response.json['data'][0]
+    self.assertFalse(result['updated'])
+    self.assertEqual(result['errors'][0]['name'], 'value')
+
+    auction = self.db.get(self.auction_id)
+    auction['value'] = value
+    auction['status'] = 'cancelled'
+    self.db.save(auction)
+    response = self.app.post_json('/auctions/lease/chronograph', {'data': {'ids': [self.auction_id]}})
+    self.assertEqual(response.json['data'], [{
+        'id': self.auction_id, 'updated': False,
+        'errors': [{'location': 'body', 'name': 'data', 'description': "Can't update auction in current (cancelled) status"}]
+    }])
+    self.assertEqual(self.db.get(self.auction_id)['_rev'], auction['_rev'])
+
+
+# AuctionPlanningResourceTest
+
+
+def planning_events(self):
+    auction = self.db.get(self.auction_id)
+    since = get_now() - timedelta(days=1)
+    till = since + timedelta(days=30)
+    events = list(iter_auctions_planned_events(self.app.app.registry, since, till))
+    self.assertEqual([event['date'] for event in events], sorted(event['date'] for event in events))
+    own = dict((event['event'], event) for event in events if event['id'] == self.auction_id)
+    self.assertEqual(own['next_check']['date'], auction['next_check'])
+    self.assertEqual(own['tenderPeriod.endDate']['date'], auction['tenderPeriod']['endDate'])
+    self.assertEqual(own['tenderPeriod.endDate']['status'], 'active.tendering')
+
+    response = self.app.get('/auctions/lease/planning', {
+        'since': since.isoformat(), 'till': till.isoformat()
+    })
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    self.assertEqual(len(response.json['data']), len(events))
+    self.assertEqual(sum(response.json['counts'].values()), len(events))
+    self.assertNotIn('next_page', response.json)
+
+    response = self.app.get('/auctions/lease/planning', {
+        'since': since.isoformat(), 'till': till.isoformat(), 'limit': 1, 'offset': 1
+    })
+    self.assertEqual(response.json['data'], [events[1]])
+    self.assertEqual(sum(response.json['counts'].values()), len(events))
+    if len(events) > 2:
+        self.assertEqual(response.json['next_page'], {'offset': 2})
+    else:
+        self.assertNotIn('next_page', response.json)
+
+    response = self.app.get('/auctions/lease/planning', {'limit': 0}, status=422)
+    self.assertEqual(response.json['errors'][0]['name'], 'limit')
+
+    # award complaint periods are left out once the auction is over
+    auction['status'] = 'complete'
+    auction['next_check'] = None
+    auction['awards'] = [{'id': 'award', 'complaintPeriod': {
+        'startDate': since.isoformat(), 'endDate': (since + timedelta(days=2)).isoformat()
+    }}]
+    self.db.save(auction)
+    events = iter_auctions_planned_events(self.app.app.registry, since, till)
+    self.assertNotIn(self.auction_id, [event['id'] for event in events])
+    auction = self.db.get(self.auction_id)
+    auction['status'] = 'active.awarded'
+    self.db.save(auction)
+    events = iter_auctions_planned_events(self.app.app.registry, since, till)
+    self.assertIn(('award.complaintPeriod.endDate', 'award'), [
+        (event['event'], event['relatedItem']) for event in events if event['id'] == self.auction_id
+    ])
+
+    response = self.app.get('/auctions/lease/planning', {'since': 'tomorrow'}, status=422)
+    self.assertEqual(response.json['errors'][0]['name'], 'since')
+
+    response = self.app.get('/auctions/lease/planning', {
+        'since': since.isoformat(), 'till': (since + timedelta(days=60)).isoformat()
+    }, status=422)
+    self.assertEqual(response.json['errors'][0]['name'], 'till')
@@ -238,3 +238,53 @@ def put_auction_offline_document(self):
     self.assertEqual(response.status, '403 Forbidden')
     self.assertEqual(response.content_type, 'application/json')
     self.assertEqual(response.json['errors'][0]["description"], "Can't update document in current (active.auction) auction status")
+
+
+def auction_documents_paging(self):
+    doc_ids = []
+    for index in range(3):
+        response = self.app.post('/auctions/{}/documents?acc_token={}'.format(
+            self.auction_id, self.auction_token
+        ), upload_files=[('file', u'name{}.doc'.format(index), 'content')])
+        self.assertEqual(response.status, '201 Created')
+        doc_ids.append(response.json["data"]['id'])
+    response = self.app.put('/auctions/{}/documents/{}?acc_token={}'.format(
+        self.auction_id, doc_ids[0], self.auction_token
+    ), upload_files=[('file', u'name0.doc', 'content2')])
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.get('/auctions/{}/documents?all=1'.format(self.auction_id))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    self.assertEqual([i['id'] for i in response.json['data']], doc_ids + doc_ids[:1])
+    self.assertNotIn('next_page', response.json)
+
+    response = self.app.get('/auctions/{}/documents?all=1&limit=2'.format(self.auction_id))
+    self.assertEqual([i['id'] for i in response.json['data']], doc_ids[:2])
+    self.assertEqual(response.json['next_page'], {'offset': 2})
+
+    response = self.app.get('/auctions/{}/documents?all=1&limit=2&offset=2'.format(self.auction_id))
+    self.assertEqual([i['id'] for i in response.json['data']], [doc_ids[2], doc_ids[0]])
+    self.assertNotIn('next_page', response.json)
+
+    response = self.app.get('/auctions/{}/documents'.format(self.auction_id))
+    self.assertEqual([i['id'] for i in response.json['data']], doc_ids[1:] + doc_ids[:1])
+
+    response = self.app.get('/auctions/{}/documents?limit=1&offset=1'.format(self.auction_id))
+    self.assertEqual([i['id'] for i in response.json['data']], doc_ids[2:])
+    self.assertEqual(response.json['next_page'], {'offset': 2})
+
+    response = self.app.get('/auctions/{}/documents?limit=two'.format(self.auction_id), status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Should be a positive integer.', u'location': u'params', u'name': u'limit'}
+    ])
+
+    response = self.app.get('/auctions/{}/documents?all=1&limit=0'.format(self.auction_id), status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Should be a positive integer.', u'location': u'params', u'name': u'limit'}
+    ])
+
+    response = self.app.get('/auctions/{}/documents?offset=-1'.format(self.auction_id), status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Should be a non-negative integer.', u'location': u'params', u'name': u'offset'}
+    ])
@@ -3,9 +3,23 @@ from copy import deepcopy
 from datetime import timedelta
 from uuid import uuid4
 
+import mock
+
 from openprocurement.auctions.core.utils import get_now
 
-from openprocurement.auctions.lease.migration import migrate_data
+from openprocurement.auctions.lease.migration import (
+    SCHEMA_DOC,
+    from0to1,
+    get_db_schema_version,
+    get_migration_checkpoint,
+    get_online_migration_since,
+    iter_procurement_method_type_rows,
+    migrate_data,
+    OnlineMigration,
+    set_migration_checkpoint,
+    set_online_migration,
+)
+from openprocurement.auctions.lease.models import Auction
 # MigrateTestFrom1To2Bids
 
 def migrate_one_pending(self):
@@ -1217,3 +1231,131 @@ def migrate_unsuccessful_unsuccessful_active(self):
     self.assertEqual(auction['awards'][1]['status'], 'unsuccessful')
     self.assertEqual(auction['awards'][2]['status'], 'active')
     self.assertEqual(auction['contracts'][0]['status'], 'pending')
+
+
+# MigrateTestEngine
+
+def migrate_dry_run(self):
+    rev = self.db.get(self.auction_id)['_rev']
+    for workers in (1, 2):
+        stats = from0to1(self.app.app.registry, workers=workers, dry_run=True)
+        self.assertEqual(stats['failed'], 0)
+        self.assertGreaterEqual(stats['processed'], 1)
+        self.assertEqual(len(stats['changed_ids']), stats['changed'])
+    self.assertEqual(self.db.get(self.auction_id)['_rev'], rev)
+    self.assertEqual(get_db_schema_version(self.db), 0)
+    self.assertIsNone(get_migration_checkpoint(self.db, 'from0to1'))
+
+
+def migrate_resume_from_checkpoint(self):
+    row = [[i.key, i.id] for i in self.db.view('lease_auctions/by_procurementMethodType') if i.id == self.auction_id][0]
+    rev = self.db.get(self.auction_id)['_rev']
+    set_migration_checkpoint(self.db, 'from0to1', row)
+    self.assertEqual(get_migration_checkpoint(self.db, 'from0to1'), row)
+    self.assertIsNone(get_migration_checkpoint(self.db, 'from1to2'))
+
+    migrate_data(self.app.app.registry, 1)
+    self.assertEqual(self.db.get(self.auction_id)['_rev'], rev)
+    self.assertEqual(get_db_schema_version(self.db), 1)
+    self.assertNotIn('checkpoint', self.db.get(SCHEMA_DOC))
+
+
+def migrate_only_lease_auctions(self):
+    other_id = uuid4().hex
+    self.db.save({'_id': other_id, 'doc_type': 'Auction', 'procurementMethodType': 'dgfOtherAssets'})
+    procurement_method_type = self.db.get(self.auction_id)['procurementMethodType']
+    ids = [row[1] for row, doc in iter_procurement_method_type_rows(self.db, [procurement_method_type])]
+    self.assertIn(self.auction_id, ids)
+    self.assertNotIn(other_id, ids)
+
+    ids = [row[1] for row, doc in iter_procurement_method_type_rows(
+        self.db, [procurement_method_type], [procurement_method_type, self.auction_id]
+    )]
+    self.assertNotIn(self.auction_id, ids)
+
+    rev = self.db.get(other_id)['_rev']
+    migrate_data(self.app.app.registry, 1)
+    self.assertEqual(self.db.get(other_id)['_rev'], rev)
+
+
+def migrate_skip_unchanged(self):
+    registry = self.app.app.registry
+    auction = self.db.get(self.auction_id)
+    stats = from0to1(registry, dry_run=True)
+    self.assertNotIn(self.auction_id, stats['changed_ids'])
+
+    stats = from0to1(registry)
+    self.assertEqual(stats['changed'], 0)
+    self.assertEqual(stats['unchanged'], stats['processed'])
+    self.assertEqual(self.db.get(self.auction_id), auction)
+
+    # the model restores the default value on migration
+    self.assertEqual(auction.pop('awardCriteria'), 'highestCost')
+    self.db.save(auction)
+    stats = from0to1(registry)
+    self.assertEqual(stats['changed'], 1)
+    migrated = self.db.get(self.auction_id)
+    self.assertNotEqual(migrated['_rev'], auction['_rev'])
+    self.assertNotEqual(migrated['dateModified'], auction['dateModified'])
+
+
+# MigrateTestOnline
+
+def migrate_online(self):
+    auction = self.db.get(self.auction_id)
+    auction['awards'] = [{
+        'id': uuid4().hex,
+        "date": get_now().isoformat(),
+        "bid_id": auction['bids'][1]['id'],
+        "status": "pending",
+        "complaintPeriod": {
+            "startDate": get_now().isoformat(),
+        }
+    }]
+    self.db.save(auction)
+
+    # not started unless the online_migration option is set
+    with mock.patch('openprocurement.auctions.lease.migration.start_online_migration') as start:
+        migrate_data(self.app.app.registry)
+        self.assertFalse(start.called)
+        with mock.patch.object(self.app.app.registry, 'lease_online_migration', True, create=True):
+            migrate_data(self.app.app.registry)
+        start.assert_called_once_with(self.app.app.registry, None)
+    self.assertEqual(get_db_schema_version(self.db), 0)
+
+    migration = OnlineMigration(self.app.app.registry)
+    set_online_migration(migration)
+    self.addCleanup(set_online_migration, None)
+
+    # payloads are not upgraded, only stored documents
+    payload = deepcopy(self.db.get(self.auction_id))
+    del payload['_rev']
+    Auction(payload)
+    self.assertEqual(len(payload['awards']), 1)
+
+    # saved since the migration started, so stored upgraded already
+    self.assertEqual(get_online_migration_since(self.db), migration.since)
+    saved = dict(self.db.get(self.auction_id), dateModified=get_now().isoformat())
+    Auction(saved)
+    self.assertEqual(len(saved['awards']), 1)
+
+    # not migrated yet, upgraded on read only
+    auction = self.app.get('/auctions/{}'.format(self.auction_id)).json['data']
+    self.assertEqual(len(auction['awards']), 2)
+    self.assertEqual(auction['awards'][0]['status'], 'pending.payment')
+    self.assertEqual(auction['awards'][1]['status'], 'pending.waiting')
+    self.assertEqual(len(self.db.get(self.auction_id)['awards']), 1)
+
+    with mock.patch('openprocurement.auctions.lease.migration.MIGRATION_WORKERS', 4), \
+            mock.patch('openprocurement.auctions.lease.migration.Pool') as pool:
+        migration.run()
+        self.assertFalse(pool.called)
+    self.assertTrue(migration.finished)
+    self.assertEqual(get_db_schema_version(self.db), 1)
+    self.assertNotIn('online', self.db.get(SCHEMA_DOC))
+    self.assertNotIn('online_since', self.db.get(SCHEMA_DOC))
+    self.assertEqual([i['status'] for i in self.db.get(self.auction_id)['awards']],
+                     ['pending.payment', 'pending.waiting'])
+    response = self.app.get('/auctions/{}'.format(self.auction_id))
+    self.assertEqual([i['id'] for i in response.json['data']['awards']], [i['id'] for i in auction['awards']])
+
@@ -4,14 +4,22 @@ import unittest
 from copy import deepcopy
 from datetime import timedelta, time
 from iso8601 import parse_date
+import mock
 
 from openprocurement.auctions.core.constants import (
     DGF_CDB2_CLASSIFICATION_PRECISELY_FROM as CLASSIFICATION_PRECISELY_FROM,
     DGF_CDB2_ADDRESS_REQUIRED_FROM as DGF_ADDRESS_REQUIRED_FROM
 )
 from openprocurement.auctions.core.tests.base import JSON_RENDERER_ERROR
-from openprocurement.auctions.core.utils import get_now, calculate_business_date, SANDBOX_MODE, TZ
+from openprocurement.auctions.core.utils import (
+    get_now,
+    calculate_business_date,
+    generate_rectificationPeriod_tender_period_margin,
+    SANDBOX_MODE,
+    TZ,
+)
 
+from openprocurement.auctions.lease.adapters import _auction_periods_plans
 from openprocurement.auctions.lease.constants import (
   MINIMAL_PERIOD_FROM_RECTIFICATION_END
 )
@@ -516,6 +524,78 @@ def create_auction_generated(self):
     self.assertNotEqual(data['auctionID'], auction['auctionID'])
 
 
+def get_auction_opt_fields(self):
+    response = self.app.post_json('/auctions', {'data': self.initial_data})
+    self.assertEqual(response.status, '201 Created')
+    auction = response.json['data']
+
+    response = self.app.get('/auctions/{}?opt_fields=status,next_check,tenderPeriod'.format(auction['id']))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    self.assertEqual(response.json['data'], {
+        'id': auction['id'],
+        'status': auction['status'],
+        'next_check': auction['next_check'],
+        'tenderPeriod': auction['tenderPeriod'],
+    })
+
+    response = self.app.get('/auctions/{}?fields=contractTerms,owner_token'.format(auction['id']))
+    self.assertEqual(response.json['data'], {
+        'id': auction['id'],
+        'contractTerms': auction['contractTerms'],
+    })
+
+    response = self.app.get('/auctions/{}?opt_fields=unknown'.format(auction['id']))
+    self.assertEqual(response.json['data'], {'id': auction['id']})
+
+
+def get_auction_not_modified(self):
+    response = self.app.post_json('/auctions', {'data': self.initial_data})
+    self.assertEqual(response.status, '201 Created')
+    auction = response.json['data']
+    owner_token = response.json['access']['token']
+
+    response = self.app.get('/auctions/{}'.format(auction['id']))
+    self.assertEqual(response.status, '200 OK')
+    etag = response.headers['ETag']
+    last_modified = response.headers['Last-Modified']
+
+    response = self.app.get('/auctions/{}'.format(auction['id']), headers={'If-None-Match': etag}, status=304)
+    self.assertEqual(response.status, '304 Not Modified')
+    self.assertEqual(response.body, '')
+    self.assertEqual(response.headers['ETag'], etag)
+
+    response = self.app.get('/auctions/{}'.format(auction['id']), headers={'If-Modified-Since': last_modified})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.get('/auctions/{}/documents'.format(auction['id']), headers={'If-None-Match': etag})
+    self.assertEqual(response.status, '200 OK')
+    documents_etag = response.headers['ETag']
+    self.assertNotEqual(documents_etag, etag)
+    response = self.app.get('/auctions/{}/documents'.format(auction['id']), headers={'If-None-Match': documents_etag}, status=304)
+    self.assertEqual(response.status, '304 Not Modified')
+
+    response = self.app.get('/auctions/{}?opt_fields=status'.format(auction['id']), headers={'If-None-Match': etag})
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.json['data'], {'id': auction['id'], 'status': auction['status']})
+
+    start_date = parse_date(auction['auctionPeriod']['startDate'])
+    with mock.patch('openprocurement.auctions.lease.models.get_now', return_value=start_date + timedelta(days=1)):
+        response = self.app.get('/auctions/{}'.format(auction['id']), headers={'If-None-Match': etag})
+    self.assertEqual(response.status, '200 OK')
+    self.assertNotEqual(response.json['data']['auctionPeriod']['shouldStartAfter'],
+                        auction['auctionPeriod']['shouldStartAfter'])
+    self.assertNotEqual(response.headers['ETag'], etag)
+
+    response = self.app.patch_json('/auctions/{}?acc_token={}'.format(auction['id'], owner_token), {'data': {'title': u'Нова назва'}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.get('/auctions/{}'.format(auction['id']), headers={'If-None-Match': etag})
+    self.assertEqual(response.status, '200 OK')
+    self.assertNotEqual(response.headers['ETag'], etag)
+    self.assertEqual(response.json['data']['title'], u'Нова назва')
+
+
 def create_auction(self):
     response = self.app.get('/auctions')
     self.assertEqual(response.status, '200 OK')
@@ -1388,3 +1468,138 @@ def first_bid_auction(self):
     self.assertEqual(response.status, '403 Forbidden')
     self.assertEqual(response.content_type, 'application/json')
     self.assertEqual(response.json['errors'][0]["description"], "Can't update document in current (complete) auction status")
+
+
+def create_auctions_bulk(self):
+    invalid_data = deepcopy(self.initial_data)
+    del invalid_data['items']
+    response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': [
+        self.initial_data, invalid_data, self.initial_data, {'procurementMethodType': 'invalid_value'}
+    ]}})
+    self.assertEqual(response.status, '201 Created')
+    self.assertEqual(response.content_type, 'application/json')
+    results = response.json['data']
+    self.assertEqual(len(results), 4)
+    self.assertEqual(results[1]['errors'], [
+        {u'description': [u'This field is required.'], u'location': u'body', u'name': u'items'}
+    ])
+    self.assertEqual(results[3]['errors'], [
+        {u'description': u'procurementMethodType is not implemented', u'location': u'body', u'name': u'data'}
+    ])
+    self.assertNotEqual(results[0]['auctionID'], results[2]['auctionID'])
+
+    auctions = []
+    for result in (results[0], results[2]):
+        self.assertIn('rev', result)
+        self.assertEqual(result['status'], 'active.tendering')
+        response = self.app.get('/auctions/{}'.format(result['id']))
+        auction = response.json['data']
+        self.assertEqual(auction['auctionID'], result['auctionID'])
+        self.assertEqual(auction['items'][0]['additionalClassifications'][-1]['id'], u'PA01-7')
+        auctions.append(auction)
+    self.assertEqual(auctions[0]['tenderPeriod']['endDate'], auctions[1]['tenderPeriod']['endDate'])
+
+    response = self.app.post_json('/auctions', {'data': self.initial_data})
+    self.assertEqual(response.json['data']['tenderPeriod']['endDate'], auctions[0]['tenderPeriod']['endDate'])
+
+    response = self.app.patch_json('/auctions/{}?acc_token={}'.format(
+        results[0]['id'], results[0]['access']['token']
+    ), {'data': {'title': u'bulk auction'}})
+    self.assertEqual(response.status, '200 OK')
+
+    response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': []}}, status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Please provide a non-empty list of auctions.', u'location': u'body', u'name': u'auctions'}
+    ])
+
+    self.app.authorization = ('Basic', ('broker2', ''))
+    response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': [self.initial_data]}}, status=403)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Broker Accreditation level does not permit auction creation',
+         u'location': u'procurementMethodType', u'name': u'accreditation'}
+    ])
+
+    self.app.authorization = ('Basic', ('broker1t', ''))
+    test_data = deepcopy(self.initial_data)
+    test_data['mode'] = u'test'
+    response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': [test_data, self.initial_data]}}, status=403)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Broker Accreditation level does not permit auction creation',
+         u'location': u'procurementMethodType', u'name': u'mode'}
+    ])
+    response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': [test_data]}})
+    self.assertEqual(response.status, '201 Created')
+    self.assertIn('rev', response.json['data'][0])
+
+
+def create_auctions_bulk_write_failure(self):
+    db = self.app.app.registry.db
+    update = db.update
+
+    def update_with_conflict(docs):
+        answers = update(docs[:1])
+        return answers + [(False, doc['_id'], Exception('Document update conflict.')) for doc in docs[1:]]
+
+    with mock.patch.object(db, 'update', side_effect=update_with_conflict):
+        response = self.app.post_json('/auctions/lease/bulk', {'data': {'auctions': [
+            self.initial_data, {'procurementMethodType': 'invalid_value'}, self.initial_data
+        ]}})
+    self.assertEqual(response.status, '201 Created')
+    results = response.json['data']
+    self.assertIn('rev', results[0])
+    self.assertEqual(results[1]['errors'][0]['name'], 'data')
+    self.assertEqual(results[2], {'errors': [
+        {u'description': u'Document update conflict.', u'location': u'body', u'name': u'data'}
+    ]})
+    response = self.app.get('/auctions/{}'.format(results[0]['id']))
+    self.assertEqual(response.status, '200 OK')
+
+
+def create_auction_periods_plan(self):
+    start_date = TZ.localize(parse_date(self.initial_data['auctionPeriod']['startDate'], None).replace(tzinfo=None))
+    auctions = []
+    for _ in range(2):
+        response = self.app.post_json('/auctions', {'data': self.initial_data})
+        self.assertEqual(response.status, '201 Created')
+        auctions.append(response.json['data'])
+    self.assertEqual(auctions[0]['tenderPeriod']['endDate'], auctions[1]['tenderPeriod']['endDate'])
+    self.assertEqual(auctions[0]['rectificationPeriod']['endDate'], auctions[1]['rectificationPeriod']['endDate'])
+    self.assertNotEqual(auctions[0]['rectificationPeriod']['startDate'], auctions[1]['rectificationPeriod']['startDate'])
+
+    plan = _auction_periods_plans.get((start_date, self.initial_data.get('procurementMethodDetails')))
+    self.assertIsNotNone(plan)
+    self.assertEqual(plan.end_date.isoformat(), auctions[0]['tenderPeriod']['endDate'])
+    key = (plan.three_workingDays_before_startDate if self.initial_data.get('tenderPeriod') else plan.end_date,
+           self.initial_data.get('procurementMethodDetails'))
+    self.assertEqual(plan._rectification_ends[key].isoformat(), auctions[0]['rectificationPeriod']['endDate'])
+
+    # the core helper still builds the period, from the memoized end date
+    with mock.patch('openprocurement.auctions.lease.adapters.generate_rectificationPeriod_tender_period_margin',
+                    side_effect=generate_rectificationPeriod_tender_period_margin) as helper:
+        response = self.app.post_json('/auctions', {'data': self.initial_data})
+    self.assertEqual(helper.call_count, 1)
+    self.assertEqual(response.json['data']['rectificationPeriod']['endDate'], auctions[0]['rectificationPeriod']['endDate'])
+
+
+def get_auction_lease_schedule(self):
+    response = self.app.post_json('/auctions', {'data': self.initial_data})
+    self.assertEqual(response.status, '201 Created')
+    auction = response.json['data']
+
+    response = self.app.get('/auctions/{}/lease_schedule'.format(auction['id']))
+    self.assertEqual(response.status, '200 OK')
+    self.assertEqual(response.content_type, 'application/json')
+    data = response.json['data']
+    self.assertEqual(data['amount'], auction['value']['amount'])
+    self.assertEqual(data['periods'], 120)
+    self.assertEqual(data['schedule'][0]['amount'], 100.0)
+    self.assertEqual(data['schedule'][-1]['endPeriod'], 120)
+    self.assertAlmostEqual(data['total'], sum(run['total'] for run in data['schedule']), places=2)
+
+    response = self.app.get('/auctions/{}/lease_schedule?amount=1000'.format(auction['id']))
+    self.assertGreater(response.json['data']['total'], data['total'])
+
+    response = self.app.get('/auctions/{}/lease_schedule?amount=many'.format(auction['id']), status=422)
+    self.assertEqual(response.json['errors'], [
+        {u'description': u'Should be a non-negative number.', u'location': u'params', u'name': u'amount'}
+    ])
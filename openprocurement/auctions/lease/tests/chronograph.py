@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 import unittest
+from datetime import timedelta
+
+import mock
+import munch
 
 from openprocurement.auctions.core.tests.base import snitch
+from openprocurement.auctions.core.utils import get_now
 from openprocurement.auctions.core.tests.blanks.chronograph_blanks import (
     # AuctionSwitchAuctionResourceTest
     switch_to_auction,
@@ -18,10 +23,22 @@ from openprocurement.auctions.lease.tests.base import (
     BaseAuctionWebTest, test_lots, test_bids, test_financial_auction_data,
     test_financial_organization, test_financial_bids,
 )
+from openprocurement.auctions.lease.utils import (
+    check_complaints_status,
+    index_stand_still_ends,
+    prune_bids,
+)
 from openprocurement.auctions.lease.tests.blanks.chronograph_blanks import (
     # AuctionSwitchQualificationResourceTest
     switch_to_qualification,
     switch_to_qualification1,
+    # AuctionNextCheckIndexTest
+    next_check_index,
+    # AuctionSwitchAuctionBulkResourceTest
+    switch_to_auction_bulk,
+    switch_to_auction_bulk_errors,
+    # AuctionPlanningResourceTest
+    planning_events,
 )
 
 
@@ -37,11 +54,109 @@ class AuctionSwitchAuctionResourceTest(BaseAuctionWebTest):
     test_switch_to_auction = snitch(switch_to_auction)
 
 
+class AuctionSwitchAuctionBulkResourceTest(BaseAuctionWebTest):
+    initial_bids = test_bids
+
+    test_switch_to_auction_bulk = snitch(switch_to_auction_bulk)
+    test_switch_to_auction_bulk_errors = snitch(switch_to_auction_bulk_errors)
+
+
 class AuctionSwitchUnsuccessfulResourceTest(BaseAuctionWebTest):
 
     test_switch_to_unsuccessful = snitch(switch_to_unsuccessful)
 
 
+class AuctionNextCheckIndexTest(BaseAuctionWebTest):
+
+    test_next_check_index = snitch(next_check_index)
+
+
+class AuctionPlanningResourceTest(BaseAuctionWebTest):
+
+    test_planning_events = snitch(planning_events)
+
+
+class CheckStatusIndexTest(unittest.TestCase):
+
+    def test_stand_still_ends(self):
+        now = get_now()
+        awards = [
+            munch.Munch(lotID=lot_id, complaintPeriod=munch.Munch(endDate=end))
+            for lot_id, end in [
+                ('a', now), ('a', now + timedelta(days=1)), ('b', None), (None, now - timedelta(days=1)),
+            ]
+        ]
+        ends = index_stand_still_ends(awards)
+        self.assertEqual(ends, {'a': now + timedelta(days=1), None: now - timedelta(days=1)})
+
+    @mock.patch('openprocurement.auctions.lease.utils.check_complaint_status')
+    def test_complaints_skipped_before_deadlines(self, mock_check_complaint_status):
+        now = get_now()
+        claim = munch.Munch(status='claim', dateSubmitted=now - timedelta(days=30), dateAnswered=None)
+        answered = munch.Munch(status='answered', dateSubmitted=now - timedelta(days=30), dateAnswered=now)
+        pending = munch.Munch(status='pending')
+        resolved = munch.Munch(status='resolved')
+        award_claim = munch.Munch(status='claim', dateSubmitted=now, dateAnswered=None)
+        auction = munch.Munch(
+            status='active.qualification',
+            procurementMethodDetails=None,
+            # stale, the deadline of claim has passed already
+            next_check=(now + timedelta(days=1)).isoformat(),
+            complaints=[claim, answered, pending, resolved],
+            awards=[munch.Munch(complaints=[award_claim])],
+        )
+        check_complaints_status(None, auction, now)
+        self.assertEqual(mock_check_complaint_status.call_args_list, [
+            mock.call(None, claim, now), mock.call(None, pending, now),
+        ])
+
+        mock_check_complaint_status.reset_mock()
+        check_complaints_status(None, auction, now + timedelta(days=30))
+        self.assertEqual(mock_check_complaint_status.call_args_list, [
+            mock.call(None, claim, now + timedelta(days=30)),
+            mock.call(None, award_claim, now + timedelta(days=30)),
+            mock.call(None, answered, now + timedelta(days=30)),
+            mock.call(None, pending, now + timedelta(days=30)),
+        ])
+
+    @mock.patch('openprocurement.auctions.lease.utils.calculate_business_date')
+    @mock.patch('openprocurement.auctions.lease.utils.check_complaint_status')
+    def test_calendar_deadline_checked_first(self, mock_check_complaint_status, mock_calculate_business_date):
+        now = get_now()
+        mock_calculate_business_date.return_value = now
+        claim = munch.Munch(status='claim', dateSubmitted=now - timedelta(days=30), dateAnswered=None)
+        answered = munch.Munch(status='answered', dateSubmitted=now - timedelta(days=30), dateAnswered=now)
+        auction = munch.Munch(procurementMethodDetails=None, complaints=[claim, answered], awards=[])
+        check_complaints_status(None, auction, now)
+        mock_calculate_business_date.assert_called_once_with(claim.dateSubmitted, mock.ANY, auction)
+        self.assertEqual(mock_check_complaint_status.call_args_list, [mock.call(None, claim, now)])
+
+        mock_calculate_business_date.reset_mock()
+        auction.procurementMethodDetails = u'quick, accelerator=1440'
+        check_complaints_status(None, auction, now)
+        self.assertEqual(mock_calculate_business_date.call_count, 2)
+
+
+class PruneBidsTest(unittest.TestCase):
+
+    @mock.patch('openprocurement.auctions.lease.utils.context_unpack')
+    def test_prune_bids(self, mock_context_unpack):
+        bids = [munch.Munch(id=i, status=status) for i, status in enumerate(
+            ['draft', 'active', 'invalid', 'active', 'draft', 'active']
+        )]
+        auction = munch.Munch(bids=bids)
+        request = munch.Munch(validated={'auction': auction})
+        self.assertEqual(prune_bids(request), {'active': 3, 'draft': 2, 'invalid': 1})
+        self.assertIs(auction.bids, bids)
+        self.assertEqual([bid.id for bid in bids], [1, 3, 5])
+        self.assertEqual(mock_context_unpack.call_count, 2)
+
+        mock_context_unpack.reset_mock()
+        self.assertEqual(prune_bids(request), {'active': 3, 'draft': 0, 'invalid': 0})
+        self.assertEqual(len(bids), 3)
+        self.assertFalse(mock_context_unpack.called)
+
+
 @unittest.skip("option not available")
 class AuctionLotSwitchQualificationResourceTest(AuctionSwitchQualificationResourceTest):
     initial_lots = test_lots
@@ -107,13 +222,18 @@ class AuctionLotAwardComplaintSwitchResourceTest(AuctionAwardComplaintSwitchReso
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(AuctionAwardComplaintSwitchResourceTest))
+    suite.addTest(unittest.makeSuite(CheckStatusIndexTest))
+    suite.addTest(unittest.makeSuite(PruneBidsTest))
     suite.addTest(unittest.makeSuite(AuctionComplaintSwitchResourceTest))
     suite.addTest(unittest.makeSuite(AuctionLotAwardComplaintSwitchResourceTest))
     suite.addTest(unittest.makeSuite(AuctionLotComplaintSwitchResourceTest))
     suite.addTest(unittest.makeSuite(AuctionLotSwitchAuctionResourceTest))
     suite.addTest(unittest.makeSuite(AuctionLotSwitchQualificationResourceTest))
     suite.addTest(unittest.makeSuite(AuctionLotSwitchUnsuccessfulResourceTest))
+    suite.addTest(unittest.makeSuite(AuctionNextCheckIndexTest))
+    suite.addTest(unittest.makeSuite(AuctionPlanningResourceTest))
     suite.addTest(unittest.makeSuite(AuctionSwitchAuctionResourceTest))
+    suite.addTest(unittest.makeSuite(AuctionSwitchAuctionBulkResourceTest))
     suite.addTest(unittest.makeSuite(AuctionSwitchQualificationResourceTest))
     suite.addTest(unittest.makeSuite(AuctionSwitchUnsuccessfulResourceTest))
     return suite
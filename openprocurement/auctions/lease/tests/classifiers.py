@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import mock
+from schematics.exceptions import ModelValidationError, ValidationError
+
+from openprocurement.auctions.core.models.schema import dgfCDB2CPVCAVClassification
+from openprocurement.auctions.lease.classifiers import (
+    CAV_PS_CODES,
+    CPVS_CODES,
+    ClassifierIndex,
+    read_json,
+)
+from openprocurement.auctions.lease.constants import MANDATORY_ADDITIONAL_CLASSIFICATOR
+from openprocurement.auctions.lease.models import PropertyLeaseClassification
+from openprocurement.auctions.lease.utils import normalize_additional_classifications
+
+
+class ClassifierIndexTest(unittest.TestCase):
+
+    def test_lazy_loading(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [u'04121000-2', u'04120000-5', u'06112000-0']
+
+        index = ClassifierIndex(loader)
+        self.assertEqual(calls, [])
+        self.assertIn(u'04121000-2', index)
+        self.assertNotIn(u'04121000-3', index)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(calls, [1])
+
+    def test_choices_keep_order(self):
+        index = ClassifierIndex(lambda: [u'06112000-0', u'04121000-2'])
+        self.assertEqual(index.choices, [u'06112000-0', u'04121000-2'])
+        self.assertEqual(index.codes, frozenset([u'04121000-2', u'06112000-0']))
+        self.assertIsNone(ClassifierIndex(lambda: None).choices)
+
+    def test_prefix_lookup(self):
+        index = ClassifierIndex(lambda: [u'04121000-2', u'04120000-5', u'06112000-0'])
+        self.assertEqual(index.startswith(u'0412'), (u'04120000-5', u'04121000-2'))
+        self.assertEqual(index.startswith(u'05'), ())
+        self.assertTrue(index.match(u'0412*'))
+        self.assertTrue(index.match(u'06112000-0'))
+        self.assertFalse(index.match(u'0611200-0'))
+        self.assertFalse(index.match(u'07*'))
+
+    def test_package_classifiers(self):
+        self.assertEqual(CAV_PS_CODES.codes, frozenset(read_json('cav_ps.json')))
+        self.assertEqual(CPVS_CODES.codes, frozenset(read_json('cpvs.json')))
+        self.assertIn(u'PA01-7', CPVS_CODES)
+        self.assertTrue(all(i.startswith(u'041') for i in CAV_PS_CODES.startswith(u'041')))
+
+
+class PropertyLeaseClassificationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base_validate_id = mock.Mock()
+        patcher = mock.patch.dict(dgfCDB2CPVCAVClassification._validator_functions, {'id': self.base_validate_id})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def validate(self, code, choices):
+        codes = ClassifierIndex(lambda: choices)
+        with mock.patch('openprocurement.auctions.lease.models.BASE_CLASSIFICATION_CODES', codes):
+            PropertyLeaseClassification({
+                'scheme': u'CAV-PS', 'id': code, 'description': u'Нерухоме майно'
+            }).validate()
+
+    def test_base_choices(self):
+        self.validate(u'04121000-2', [u'06112000-0', u'04121000-2'])
+        self.assertEqual(self.base_validate_id.call_count, 1)
+
+        with self.assertRaises(ModelValidationError) as context:
+            self.validate(u'04121000-3', [u'06112000-0', u'04121000-2'])
+        self.assertEqual(context.exception.messages, {'id': [u"Value must be one of [u'06112000-0', u'04121000-2']."]})
+        self.assertEqual(self.base_validate_id.call_count, 1)
+
+        with self.assertRaises(ModelValidationError):
+            self.validate(u'04121000-2', [])
+
+    def test_base_validator_without_choices(self):
+        self.validate(u'04121000-2', None)
+        self.assertEqual(self.base_validate_id.call_count, 1)
+
+        self.base_validate_id.side_effect = ValidationError(u'Value must be one of CAV-PS codes.')
+        with self.assertRaises(ModelValidationError) as context:
+            self.validate(u'04121000-3', None)
+        self.assertEqual(context.exception.messages, {'id': [u'Value must be one of CAV-PS codes.']})
+
+
+class AdditionalClassificationsTest(unittest.TestCase):
+
+    def test_normalize_raw_items(self):
+        other = {'scheme': u'CPVS', 'id': u'HA28-9', 'description': u'other'}
+        items = [
+            {'additionalClassifications': [dict(other)]},
+            {'additionalClassifications': [dict(MANDATORY_ADDITIONAL_CLASSIFICATOR)]},
+            {'additionalClassifications': []},
+        ]
+        self.assertEqual(normalize_additional_classifications(items), 2)
+        self.assertEqual(items[0]['additionalClassifications'], [other, MANDATORY_ADDITIONAL_CLASSIFICATOR])
+        self.assertEqual(items[1]['additionalClassifications'], [MANDATORY_ADDITIONAL_CLASSIFICATOR])
+        self.assertEqual(items[2]['additionalClassifications'], [MANDATORY_ADDITIONAL_CLASSIFICATOR])
+        self.assertEqual(normalize_additional_classifications(items), 0)
+
+
+def suite():
+    tests = unittest.TestSuite()
+    tests.addTest(unittest.makeSuite(ClassifierIndexTest))
+    tests.addTest(unittest.makeSuite(PropertyLeaseClassificationTest))
+    tests.addTest(unittest.makeSuite(AdditionalClassificationsTest))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
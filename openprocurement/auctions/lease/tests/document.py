@@ -20,7 +20,8 @@ from openprocurement.auctions.core.tests.blanks.document_blanks import (
 from openprocurement.auctions.lease.tests.base import BaseAuctionWebTest,  test_financial_auction_data, test_bids, test_financial_bids
 from openprocurement.auctions.lease.tests.blanks.document_blanks import (
     create_auction_document,
-    put_auction_offline_document
+    put_auction_offline_document,
+    auction_documents_paging,
 )
 
 class AuctionDocumentResourceTestMixin(object):
@@ -32,6 +33,7 @@ class AuctionDocumentResourceTestMixin(object):
 
 class AuctionDocumentResourceTest(BaseAuctionWebTest, AuctionDocumentResourceTestMixin):
     docservice = False
+    test_auction_documents_paging = snitch(auction_documents_paging)
 
 
 class AuctionDocumentWithDSResourceTest(BaseAuctionWebTest, AuctionDocumentResourceTestMixin):
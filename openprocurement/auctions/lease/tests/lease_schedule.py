@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import unittest
+from decimal import Decimal, ROUND_HALF_UP
+
+from datetime import timedelta
+
+from isodate import parse_duration
+
+from openprocurement.auctions.lease.lease_schedule import (
+    duration_months,
+    get_lease_schedule,
+    get_present_value_factors,
+    iter_lease_totals,
+    rank_bids,
+)
+
+
+def make_lease_terms(duration='P1Y', holidays=(('P2M', 10),), clauses=(('P6M', 0.1),)):
+    return {
+        'leaseDuration': duration,
+        'taxHolidays': [
+            {
+                'taxHolidaysDuration': holiday_duration,
+                'conditions': 'conditions description',
+                'value': {'amount': amount, 'currency': 'UAH', 'valueAddedTaxIncluded': True},
+            }
+            for holiday_duration, amount in holidays
+        ],
+        'escalationClauses': [
+            {
+                'escalationPeriodicity': periodicity,
+                'escalationStepPercentage': step,
+                'conditions': 'conditions description',
+            }
+            for periodicity, step in clauses
+        ],
+    }
+
+
+class LeaseScheduleTest(unittest.TestCase):
+
+    def test_runs(self):
+        schedule = get_lease_schedule(make_lease_terms())
+        self.assertEqual(schedule.periods, 12)
+        self.assertEqual(
+            list(schedule.iter_payments(1000)),
+            [(0, 2, Decimal('10.00')), (2, 6, Decimal('1000.00')), (6, 12, Decimal('1100.00'))]
+        )
+        self.assertEqual(schedule.total(1000), Decimal('10620.00'))
+
+        data = schedule.serialize(1000)
+        self.assertEqual(data['total'], 10620.0)
+        self.assertEqual(sum(run['endPeriod'] - run['startPeriod'] for run in data['schedule']), 12)
+
+    def test_partial_months(self):
+        self.assertEqual(duration_months(parse_duration('P1Y')), 12)
+        self.assertEqual(duration_months(parse_duration('P1Y15D')), 13)
+        self.assertEqual(duration_months(parse_duration('P2M30D')), 3)
+        self.assertEqual(duration_months(parse_duration('P2M31D')), 4)
+        self.assertEqual(duration_months(parse_duration('P1MT1H')), 2)
+        self.assertEqual(duration_months(timedelta(days=45)), 2)
+        self.assertEqual(duration_months(timedelta(days=60)), 2)
+        self.assertEqual(duration_months(timedelta(0)), 0)
+
+        schedule = get_lease_schedule(make_lease_terms('P1Y15D', (('P1M10D', 10),), ()))
+        self.assertEqual(schedule.periods, 13)
+        self.assertEqual(
+            list(schedule.iter_payments(1000)),
+            [(0, 2, Decimal('10.00')), (2, 13, Decimal('1000.00'))]
+        )
+
+    def test_compounding_steps(self):
+        schedule = get_lease_schedule(make_lease_terms('P30Y', (), (('P1Y', 0.05), ('P5Y', 0.1))))
+        self.assertEqual(schedule.periods, 360)
+        self.assertEqual(len(schedule.runs), 30)
+        start, end, payment = list(schedule.iter_payments('333.33'))[-1]
+        self.assertEqual((start, end), (348, 360))
+        factor = Decimal('1.05') ** 29 * Decimal('1.1') ** 5
+        self.assertEqual(payment, (Decimal('333.33') * factor).quantize(Decimal('0.01'), ROUND_HALF_UP))
+
+        expected = sum(
+            (Decimal('333.33') * Decimal('1.05') ** (month // 12) * Decimal('1.1') ** (month // 60)).quantize(Decimal('0.01'), ROUND_HALF_UP)
+            for month in range(360)
+        )
+        self.assertEqual(schedule.total('333.33'), expected)
+
+    def test_shared_between_equal_terms(self):
+        terms = make_lease_terms()
+        other = make_lease_terms()
+        other['taxHolidays'][0]['id'] = 'f' * 32
+        other['taxHolidays'][0]['conditions'] = 'other conditions'
+        self.assertIs(get_lease_schedule(terms), get_lease_schedule(other))
+        self.assertIsNot(get_lease_schedule(terms), get_lease_schedule(make_lease_terms('P2Y')))
+
+    def test_batch_totals(self):
+        auctions = [
+            {'_id': 'a', 'value': {'amount': 1000}, 'contractTerms': {'leaseTerms': make_lease_terms()}},
+            {'_id': 'b', 'value': {'amount': 1000}, 'contractTerms': {'leaseTerms': make_lease_terms()},
+             'awards': [{'status': 'unsuccessful', 'value': {'amount': 900}},
+                        {'status': 'active', 'value': {'amount': 2000}}]},
+            {'_id': 'c', 'value': {'amount': 1000}},
+        ]
+        totals = list(iter_lease_totals(auctions))
+        self.assertEqual([(i['id'], i['total']) for i in totals], [
+            ('a', Decimal('10620.00')),
+            ('b', Decimal('21220.00')),
+        ])
+
+
+class PresentValueTest(unittest.TestCase):
+
+    def test_factors(self):
+        terms = make_lease_terms()
+        a, b = get_present_value_factors(terms, 0)
+        self.assertEqual((a, b), (Decimal('10.6'), Decimal('20')))
+        self.assertIs(get_present_value_factors(terms, '0'), get_present_value_factors(make_lease_terms(), 0))
+
+        discounted_a, discounted_b = get_present_value_factors(terms, '0.1')
+        discount = 1 / Decimal('1.1') ** (Decimal(1) / 12)
+        expected_a = sum(discount ** month for month in range(2, 6)) + Decimal('1.1') * sum(discount ** month for month in range(6, 12))
+        self.assertAlmostEqual(discounted_a, expected_a, places=20)
+        self.assertAlmostEqual(discounted_b, Decimal(10) * (1 + discount), places=20)
+
+    def test_rank_bids(self):
+        bids = [
+            {'id': 'low', 'value': {'amount': 900}},
+            {'id': 'high', 'value': {'amount': 1000.5}},
+            {'id': 'empty', 'value': None},
+        ]
+        ranked = rank_bids(make_lease_terms(), bids, 0)
+        self.assertEqual([bid['id'] for _, bid in ranked], ['high', 'low'])
+        self.assertEqual([value for value, _ in ranked], [Decimal('10625.30'), Decimal('9560.00')])
+
+
+def suite():
+    tests = unittest.TestSuite()
+    tests.addTest(unittest.makeSuite(LeaseScheduleTest))
+    tests.addTest(unittest.makeSuite(PresentValueTest))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -2,7 +2,10 @@
 
 import unittest
 
-from openprocurement.auctions.lease.tests import auction, award, bidder, document, tender, question, complaint
+from openprocurement.auctions.lease.tests import (
+    auction, award, bidder, document, tender, question, complaint,
+    chronograph, classifiers, lease_schedule, migration, models, working_days
+)
 
 
 def suite():
@@ -14,6 +17,12 @@ def suite():
     suite.addTest(document.suite())
     suite.addTest(question.suite())
     suite.addTest(tender.suite())
+    suite.addTest(chronograph.suite())
+    suite.addTest(classifiers.suite())
+    suite.addTest(lease_schedule.suite())
+    suite.addTest(migration.suite())
+    suite.addTest(models.suite())
+    suite.addTest(working_days.suite())
     return suite
 
 
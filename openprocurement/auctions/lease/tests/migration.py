@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+from datetime import timedelta
+from decimal import Decimal
 from uuid import uuid4
 from copy import deepcopy
 
+import mock
+
 from openprocurement.auctions.core.tests.base import snitch
+from openprocurement.auctions.core.utils import get_now
 
+from openprocurement.auctions.lease import migration
 from openprocurement.auctions.lease.migration import migrate_data, get_db_schema_version, set_db_schema_version, SCHEMA_VERSION
 from openprocurement.auctions.lease.tests.base import BaseWebTest, BaseAuctionWebTest, test_bids
 from openprocurement.auctions.lease.tests.blanks.migration_blanks import (
@@ -28,7 +34,14 @@ from openprocurement.auctions.lease.tests.blanks.migration_blanks import (
     migrate_awards_number,
     # MigrateTestFrom1To2WithThreeBids
     migrate_unsuccessful_unsuccessful_pending,
-    migrate_unsuccessful_unsuccessful_active
+    migrate_unsuccessful_unsuccessful_active,
+    # MigrateTestEngine
+    migrate_dry_run,
+    migrate_resume_from_checkpoint,
+    migrate_only_lease_auctions,
+    migrate_skip_unchanged,
+    # MigrateTestOnline
+    migrate_online,
 )
 
 
@@ -99,12 +112,63 @@ class MigrateTestFrom1To2WithThreeBids(BaseAuctionWebTest):
         self.db.save(auction)
 
 
+class MigrateTestEngine(BaseAuctionWebTest):
+    test_migrate_dry_run = snitch(migrate_dry_run)
+    test_migrate_resume_from_checkpoint = snitch(migrate_resume_from_checkpoint)
+    test_migrate_only_lease_auctions = snitch(migrate_only_lease_auctions)
+    test_migrate_skip_unchanged = snitch(migrate_skip_unchanged)
+
+    def setUp(self):
+        super(MigrateTestEngine, self).setUp()
+        migrate_data(self.app.app.registry)
+        set_db_schema_version(self.db, 0)
+
+
+class MigrateTestOnline(BaseAuctionWebTest):
+    initial_status = 'active.qualification'
+    initial_bids = test_bids
+    test_migrate_online = snitch(migrate_online)
+
+    def setUp(self):
+        super(MigrateTestOnline, self).setUp()
+        migrate_data(self.app.app.registry)
+        set_db_schema_version(self.db, 0)
+        auction = self.db.get(self.auction_id)
+        auction['bids'][0]['value']['amount'] = auction['value']['amount']
+        self.db.save(auction)
+
+
+class MigrateDocTest(unittest.TestCase):
+
+    def test_doc_hash(self):
+        doc = {'_id': uuid4().hex, '_rev': '1-a', 'value': {'amount': Decimal('100.5')}}
+        doc_hash = migration.get_doc_hash(doc)
+        self.assertEqual(migration.get_doc_hash(dict(doc, _rev='2-b')), doc_hash)
+        self.assertNotEqual(migration.get_doc_hash(dict(doc, value={'amount': Decimal('100.6')})), doc_hash)
+
+    def test_saved_since(self):
+        now = get_now()
+        self.assertTrue(migration.is_saved_since({'dateModified': now.isoformat()}, now))
+        self.assertFalse(migration.is_saved_since({'dateModified': (now - timedelta(seconds=1)).isoformat()}, now))
+        self.assertFalse(migration.is_saved_since({}, now))
+
+    def test_failed_doc(self):
+        context = {'registry': mock.MagicMock(), 'procurement_method_types': [], 'root': None}
+        with mock.patch.dict(migration._migration_context, context), \
+                mock.patch.object(migration, 'get_doc_hash', side_effect=TypeError):
+            self.assertEqual(migration.migrate_auction_doc(('row', {})), ('row', None, False, True))
+        self.assertFalse(migration._lazy_upgrade.disabled)
+
+
 def suite():
     suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(MigrateDocTest))
     suite.addTest(unittest.makeSuite(MigrateTest))
     suite.addTest(unittest.makeSuite(MigrateTestFrom1To2Bids))
     suite.addTest(unittest.makeSuite(MigrateTestFrom1To2WithTwoBids))
     suite.addTest(unittest.makeSuite(MigrateTestFrom1To2WithThreeBids))
+    suite.addTest(unittest.makeSuite(MigrateTestEngine))
+    suite.addTest(unittest.makeSuite(MigrateTestOnline))
     return suite
 
 
@@ -1,20 +1,48 @@
 # -*- coding: utf-8 -*-
 import unittest
+from copy import deepcopy
+from datetime import timedelta
+from uuid import uuid4
+
 import mock
 import munch
 
 from schematics.exceptions import ConversionError, ValidationError, ModelValidationError
 
 from openprocurement.auctions.lease.models import (
-   ContractTerms
+   Auction,
+   Bid,
+   BidCounters,
+   ContractTerms,
+   bids_validation_wrapper,
+   get_should_start_after_plan,
+   reset_bid_counters,
 )
 
+from openprocurement.auctions.lease.tests.base import test_auction_data
 from openprocurement.api.utils import get_now
 
 
 now = get_now()
 
 
+class FakeAuction(munch.Munch):
+    pass
+
+
+class FakeRequest(object):
+    method = 'PATCH'
+
+    def __init__(self, role):
+        self.role = role
+        self.role_checks = 0
+
+    @property
+    def authenticated_role(self):
+        self.role_checks += 1
+        return self.role
+
+
 class ContractTermsTest(unittest.TestCase):
 
     @mock.patch('openprocurement.auctions.lease.models.get_auction')
@@ -98,9 +126,223 @@ class ContractTermsTest(unittest.TestCase):
         contractterms.validate()
 
 
+class BidsValidationWrapperTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('openprocurement.auctions.lease.models.BaseAuction', FakeAuction)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validation_func = mock.Mock()
+        self.validator = bids_validation_wrapper(self.validation_func)
+
+    def make_bid(self, role, status='active'):
+        request = FakeRequest(role)
+        auction = FakeAuction({'__parent__': munch.Munch({'request': request})})
+        bid = munch.Munch({'__parent__': auction, 'status': status})
+        return request, bid
+
+    def test_nested_fields_resolve_bid_once(self):
+        request, bid = self.make_bid('bid_owner')
+        parameter = munch.Munch({'__parent__': bid})
+        for _ in range(5):
+            self.validator(None, {'__parent__': parameter}, 'value')
+        self.validator(None, bid, 'value')
+        self.assertEqual(self.validation_func.call_count, 6)
+        self.assertEqual(request.role_checks, 1)
+        self.assertEqual(parameter._bid_validation_context, (bid, bid['__parent__']))
+
+    def test_skipped_bids(self):
+        request, bid = self.make_bid('auction_owner')
+        self.validator(None, {'__parent__': bid}, 'value')
+        self.validator(None, bid, 'value')
+        self.assertEqual(request.role_checks, 1)
+
+        request, bid = self.make_bid('bid_owner', status='draft')
+        self.validator(None, {'__parent__': bid}, 'value')
+        self.assertEqual(request.role_checks, 0)
+        self.assertFalse(self.validation_func.called)
+
+
+class ShouldStartAfterPlanTest(unittest.TestCase):
+
+    def make_auction(self, number_of_bids=2):
+        return munch.Munch({
+            'numberOfBids': number_of_bids,
+            'status': 'active.tendering',
+            'submissionMethodDetails': None,
+            'enquiryPeriod': munch.Munch({
+                'startDate': now - timedelta(days=10),
+                'endDate': now + timedelta(days=3, seconds=1),
+            }),
+        })
+
+    @mock.patch('openprocurement.auctions.lease.models.calc_auction_end_time')
+    def test_plan_is_memoized(self, mock_calc_auction_end_time):
+        start_date = now + timedelta(days=5, seconds=2)
+        mock_calc_auction_end_time.return_value = start_date + timedelta(hours=1)
+        auction = self.make_auction()
+        plan = get_should_start_after_plan(auction, start_date)
+        self.assertIs(get_should_start_after_plan(self.make_auction(), start_date), plan)
+        mock_calc_auction_end_time.assert_called_once_with(2, start_date)
+
+        end_time, after_auction, after_enquiries = plan
+        self.assertEqual(end_time, start_date + timedelta(hours=1))
+        self.assertGreater(after_auction, end_time.isoformat())
+        self.assertGreater(after_enquiries, auction.enquiryPeriod.endDate.isoformat())
+
+        get_should_start_after_plan(self.make_auction(3), start_date)
+        self.assertEqual(mock_calc_auction_end_time.call_count, 2)
+
+
+class BidCountersTest(unittest.TestCase):
+
+    def make_bid(self, status, *lots):
+        return munch.Munch(status=status, lotValues=[munch.Munch(relatedLot=lot) for lot in lots])
+
+    def test_counters(self):
+        counters = BidCounters([
+            self.make_bid('active', 'a', 'b'), self.make_bid('active', 'a'),
+            self.make_bid('draft', 'a'), self.make_bid('invalid'),
+        ])
+        self.assertEqual(counters.total, 4)
+        self.assertEqual(counters.active, 2)
+        self.assertEqual(counters.statuses, {'active': 2, 'draft': 1, 'invalid': 1})
+        self.assertEqual(counters.lots, {'a': 2, 'b': 1})
+
+    def test_lot_values_status(self):
+        bid = self.make_bid('active', 'a', 'b', 'a')
+        bid.lotValues[1].status = 'pending'
+        self.assertEqual(BidCounters([bid]).lots, {'a': 1})
+
+    def test_kept_until_bids_change(self):
+        auction = FakeAuction(bids=[self.make_bid('active'), self.make_bid('draft')])
+        counters = Auction.bid_counters.fget(auction)
+        self.assertIs(Auction.bid_counters.fget(auction), counters)
+
+        reset_bid_counters(auction)
+        self.assertIsNot(Auction.bid_counters.fget(auction), counters)
+
+        auction.bids.append(self.make_bid('active'))
+        self.assertEqual(Auction.bid_counters.fget(auction).active, 2)
+        auction.bids = auction.bids[:1]
+        self.assertEqual(Auction.bid_counters.fget(auction).total, 1)
+
+    def make_model_bid(self, auction, status, *lots):
+        bid = Bid({
+            'id': uuid4().hex,
+            'status': status,
+            'lotValues': [{'relatedLot': lot} for lot in lots],
+        })
+        bid.__parent__ = auction
+        return bid
+
+    def test_model_bid_changes(self):
+        auction = Auction(deepcopy(test_auction_data))
+        auction.bids = [self.make_model_bid(auction, 'active', 'a'), self.make_model_bid(auction, 'draft', 'a')]
+        counters = auction.bid_counters
+        self.assertEqual(counters.active, 1)
+        self.assertEqual(counters.lots, {'a': 1})
+        self.assertIs(auction.bid_counters, counters)
+
+        auction.bids[1]['status'] = 'active'
+        self.assertEqual(auction.bid_counters.active, 2)
+        self.assertEqual(auction.bid_counters.lots, {'a': 2})
+
+        auction.bids[0].status = 'invalid'
+        self.assertEqual(auction.bid_counters.statuses, {'active': 1, 'invalid': 1})
+
+        auction.bids[1].lotValues = self.make_model_bid(auction, 'active', 'b').lotValues
+        self.assertEqual(auction.bid_counters.lots, {'b': 1})
+
+        auction.bids[1].import_data({'status': 'draft'})
+        self.assertEqual(auction.bid_counters.active, 0)
+
+        auction.bids.append(self.make_model_bid(auction, 'active'))
+        self.assertEqual(auction.numberOfBids, 3)
+        self.assertEqual(auction.bid_counters.active, 1)
+
+
+class NextCheckCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.request = mock.MagicMock()
+        self.request.registry.getAdapter.return_value.add_awarding_checks.return_value = None
+        patcher = mock.patch.object(Auction, '_calculate_next_check', autospec=True,
+                                    side_effect=Auction._calculate_next_check)
+        self.calculate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_auction(self, request):
+        data = deepcopy(test_auction_data)
+        data.update({
+            'status': 'active.auction',
+            'auctionPeriod': {'startDate': (now + timedelta(hours=1)).isoformat()},
+        })
+        auction = Auction(data)
+        auction.__parent__ = munch.Munch({'__parent__': None, 'request': request})
+        return auction
+
+    def test_hit(self):
+        auction = self.make_auction(self.request)
+        self.assertEqual(auction.next_check, auction.auctionPeriod.startDate.isoformat())
+        self.assertEqual(auction.next_check, auction.auctionPeriod.startDate.isoformat())
+        self.assertEqual(self.calculate.call_count, 1)
+
+    def test_miss_after_change(self):
+        auction = self.make_auction(self.request)
+        auction.next_check
+        auction.status = 'active.qualification'
+        self.assertIsNone(auction.next_check)
+        self.assertEqual(self.calculate.call_count, 2)
+
+    def test_miss_after_award_period_change(self):
+        auction = self.make_auction(self.request)
+        auction.awards = [{
+            'id': uuid4().hex, 'bid_id': uuid4().hex, 'status': 'pending.payment',
+            'paymentPeriod': {'startDate': now.isoformat(), 'endDate': (now + timedelta(days=1)).isoformat()},
+            'signingPeriod': {'startDate': now.isoformat(), 'endDate': (now + timedelta(days=2)).isoformat()},
+        }]
+        key = auction._next_check_key()
+        auction.awards[0].paymentPeriod.endDate = now + timedelta(hours=1)
+        self.assertNotEqual(auction._next_check_key(), key)
+        key = auction._next_check_key()
+        auction.awards[0].signingPeriod.endDate = now + timedelta(hours=1)
+        self.assertNotEqual(auction._next_check_key(), key)
+
+    def test_miss_for_another_request(self):
+        auction = self.make_auction(self.request)
+        auction.next_check
+        auction.__parent__.request = mock.MagicMock(registry=self.request.registry)
+        auction.next_check
+        self.assertEqual(self.calculate.call_count, 2)
+
+    def test_not_kept_without_request(self):
+        auction = self.make_auction(None)
+        auction.next_check
+        auction.next_check
+        self.assertEqual(self.calculate.call_count, 2)
+
+    @mock.patch('openprocurement.auctions.lease.models.calc_auction_end_time')
+    def test_expires_at_clamp_time(self, mock_calc_auction_end_time):
+        auction = self.make_auction(self.request)
+        start_date = auction.auctionPeriod.startDate
+        end_time = start_date + timedelta(hours=1)
+        mock_calc_auction_end_time.return_value = end_time
+        self.assertEqual(auction.next_check, start_date.isoformat())
+        with mock.patch('openprocurement.auctions.lease.models.get_now',
+                        return_value=start_date + timedelta(minutes=1)):
+            self.assertEqual(auction.next_check, end_time.isoformat())
+            self.assertEqual(auction.next_check, end_time.isoformat())
+        self.assertEqual(self.calculate.call_count, 2)
+
+
 def suite():
     tests = unittest.TestSuite()
     tests.addTest(unittest.makeSuite(ContractTermsTest))
+    tests.addTest(unittest.makeSuite(BidsValidationWrapperTest))
+    tests.addTest(unittest.makeSuite(ShouldStartAfterPlanTest))
+    tests.addTest(unittest.makeSuite(BidCountersTest))
+    tests.addTest(unittest.makeSuite(NextCheckCacheTest))
     return tests
 
 
@@ -58,6 +58,8 @@ from openprocurement.auctions.lease.tests.blanks.tender_blanks import (
     create_auction_rectificationPeriod_set,
     create_auction_generated,
     create_auction,
+    get_auction_opt_fields,
+    get_auction_not_modified,
     additionalClassifications,
     cavps_cpvs_classifications,
     patch_auction,
@@ -72,7 +74,11 @@ from openprocurement.auctions.lease.tests.blanks.tender_blanks import (
     one_valid_bid_auction,
     one_invalid_bid_auction,
     first_bid_auction,
-    create_auction_lease_invalid
+    create_auction_lease_invalid,
+    create_auctions_bulk,
+    create_auctions_bulk_write_failure,
+    create_auction_periods_plan,
+    get_auction_lease_schedule,
 )
 
 
@@ -102,6 +108,10 @@ class AuctionResourceTest(BaseWebTest):
     test_listing_changes = snitch(listing_changes)
     test_listing_draft = snitch(listing_draft)
     test_create_auction_draft = snitch(create_auction_draft)
+    test_create_auctions_bulk = snitch(create_auctions_bulk)
+    test_create_auctions_bulk_write_failure = snitch(create_auctions_bulk_write_failure)
+    test_create_auction_periods_plan = snitch(create_auction_periods_plan)
+    test_get_auction_lease_schedule = snitch(get_auction_lease_schedule)
     test_get_auction = snitch(get_auction)
     test_auction_not_found = snitch(auction_not_found)
     test_create_auction_validation_accelerated = snitch(create_auction_validation_accelerated)
@@ -113,6 +123,8 @@ class AuctionResourceTest(BaseWebTest):
     test_create_auction_rectificationPeriod_set = snitch(create_auction_rectificationPeriod_set)
     test_create_auction_generated = snitch(create_auction_generated)
     test_create_auction = snitch(create_auction)
+    test_get_auction_opt_fields = snitch(get_auction_opt_fields)
+    test_get_auction_not_modified = snitch(get_auction_not_modified)
     test_additionalClassifications = snitch(additionalClassifications)
     test_cavps_cpvs_classifications = snitch(cavps_cpvs_classifications)
     test_auction_features_invalid = snitch(unittest.skip("option not available")(auction_features_invalid))
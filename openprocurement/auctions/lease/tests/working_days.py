@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import datetime, timedelta
+
+from openprocurement.auctions.core.utils import (
+    calculate_business_date as base_calculate_business_date,
+)
+
+from openprocurement.auctions.lease.working_days import (
+    WorkingDaysCalendar,
+    calculate_business_date,
+)
+
+
+class WorkingDaysCalendarTest(unittest.TestCase):
+
+    def test_matches_core_calculate_business_date(self):
+        start = datetime(2018, 1, 1, 14, 30)
+        for day in xrange(0, 120, 3):
+            date_obj = start + timedelta(day)
+            for days in (-10, -5, -3, -1, 0, 1, 3, 5, 10):
+                expected = base_calculate_business_date(date_obj, timedelta(days), None, working_days=True)
+                self.assertEqual(
+                    calculate_business_date(date_obj, timedelta(days), None, working_days=True),
+                    expected, (date_obj, days)
+                )
+
+    def test_specific_hour(self):
+        date_obj = datetime(2018, 3, 15, 10, 0)
+        result = calculate_business_date(date_obj, -timedelta(days=3), None, working_days=True, specific_hour=20)
+        self.assertEqual(result, datetime(2018, 3, 12, 20, 0))
+
+    def test_holidays(self):
+        calendar = WorkingDaysCalendar({'2018-03-08': True, '2018-03-03': False})
+        self.assertNotIn(datetime(2018, 3, 8), calendar)
+        self.assertIn(datetime(2018, 3, 3), calendar)
+        self.assertNotIn(datetime(2018, 3, 4), calendar)
+        self.assertEqual(calendar.shift(datetime(2018, 3, 7, 12), timedelta(days=1)), datetime(2018, 3, 9, 12))
+        self.assertEqual(calendar.shift(datetime(2018, 3, 5, 12), timedelta(days=-1)), datetime(2018, 3, 3, 12))
+
+    def test_out_of_range(self):
+        calendar = WorkingDaysCalendar({}, today=datetime(2018, 1, 1))
+        self.assertIsNone(calendar.shift(datetime(1990, 1, 1), timedelta(days=1)))
+        self.assertIsNone(calendar.shift(datetime(2100, 1, 1), timedelta(days=1)))
+
+
+def suite():
+    tests = unittest.TestSuite()
+    tests.addTest(unittest.makeSuite(WorkingDaysCalendarTest))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
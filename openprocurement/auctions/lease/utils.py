@@ -1,27 +1,54 @@
 # -*- coding: utf-8 -*-
+from decimal import Decimal, InvalidOperation
+from hashlib import md5
+from heapq import merge
+from itertools import chain, islice
+from json import dumps
 from logging import getLogger
 
+from iso8601 import ParseError, parse_date
 from pkg_resources import get_distribution
+from schematics.exceptions import ModelConversionError, ModelValidationError
 
+from openprocurement.api.utils import generate_id
 from openprocurement.auctions.core.utils import (
     API_DOCUMENT_BLACKLISTED_FIELDS as DOCUMENT_BLACKLISTED_FIELDS,
+    AUCTIONS_COMPLAINT_STAND_STILL_TIME as COMPLAINT_STAND_STILL_TIME,
     TZ,
     check_auction_status,
     check_complaint_status,
     context_unpack,
+    error_handler,
+    generate_auction_id,
     get_file as base_get_file,
     get_now,
-    remove_draft_bids,
+    get_procurement_method_types,
     log_auction_status_change,
+    save_auction,
+    set_ownership,
     upload_file as base_upload_file
 )
 
 from .constants import (
+    CHECKED_COMPLAINT_STATUSES,
+    DEADLINE_COMPLAINT_STATUSES,
+    DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE,
     DOCUMENT_TYPE_URL_ONLY,
     DOCUMENT_TYPE_OFFLINE,
-    MANDATORY_ADDITIONAL_CLASSIFICATOR
+    MANDATORY_ADDITIONAL_CLASSIFICATOR,
+    PLANNING_MAX_WINDOW,
+    PLANNING_WINDOW,
+    PRUNED_BID_STATUSES,
+    TERMINAL_AUCTION_STATUSES,
 )
+from .design import (
+    lease_auctions_by_next_check_view,
+    lease_auctions_by_planned_event_view,
+)
+from .working_days import calculate_business_date, has_procurement_method_details
+from openprocurement.auctions.core.includeme import IContentConfigurator
 from openprocurement.auctions.core.interfaces import IAuctionManager
+from openprocurement.auctions.core.traversal import Root
 
 
 PKG = get_distribution(__package__)
@@ -52,68 +79,98 @@ def get_file(request):
     return base_get_file(request)
 
 
-def check_bids(request):
+def check_bids(request, number_of_bids=None):
     auction = request.validated['auction']
     adapter = request.registry.getAdapter(auction, IAuctionManager)
+    if number_of_bids is None:
+        number_of_bids = auction.numberOfBids
     if auction.auctionPeriod:
-        if auction.numberOfBids < (auction.minNumberOfQualifiedBids or 2):
+        if number_of_bids < (auction.minNumberOfQualifiedBids or 2):
             auction.auctionPeriod.startDate = None
             adapter.pendify_auction_status('unsuccessful')
-        elif auction.numberOfBids == 1:
+        elif number_of_bids == 1:
             auction.auctionPeriod.startDate = None
             request.content_configurator.start_awarding()
 
 
+def index_complaints(auction):
+    """Group the complaints of the auction and of its awards by status."""
+    complaints = {}
+    for complaint in chain(auction.complaints, *(award.complaints for award in auction.awards)):
+        complaints.setdefault(complaint.status, []).append(complaint)
+    return complaints
+
+
+def index_stand_still_ends(awards):
+    """Latest complaint period end of the awards of every lot, by lotID."""
+    ends = {}
+    for award in awards:
+        end = award.complaintPeriod.endDate
+        if not end:
+            continue
+        end = end.astimezone(TZ)
+        if award.lotID not in ends or ends[award.lotID] < end:
+            ends[award.lotID] = end
+    return ends
+
+
+def get_complaint_stand_still_start(complaint):
+    """Date the stand-still of a claim or of an answered complaint runs from."""
+    return complaint.dateSubmitted if complaint.status == 'claim' else complaint.dateAnswered
+
+
+def check_complaints_status(request, auction, now):
+    """Run check_complaint_status for the complaints it may move on.
+
+    Complaints are looked up by status in one pass. Claims and answered
+    complaints are skipped until their own stand-still deadline is reached.
+    Unless the auction is accelerated, the deadline is not earlier than the
+    calendar one, so calculate_business_date is only run for the complaints
+    whose calendar deadline has passed.
+    """
+    complaints = index_complaints(auction)
+    accelerated = has_procurement_method_details(auction)
+    for status in CHECKED_COMPLAINT_STATUSES:
+        for complaint in complaints.get(status, ()):
+            if status in DEADLINE_COMPLAINT_STATUSES:
+                start = get_complaint_stand_still_start(complaint)
+                if start and not accelerated and start + COMPLAINT_STAND_STILL_TIME > now:
+                    continue
+                end = start and calculate_business_date(start, COMPLAINT_STAND_STILL_TIME, auction)
+                if end and end > now:
+                    continue
+            check_complaint_status(request, complaint, now)
+
+
 def check_status(request):
     auction = request.validated['auction']
     now = get_now()
-    for complaint in auction.complaints:
-        check_complaint_status(request, complaint, now)
-    for award in auction.awards:
-        for complaint in award.complaints:
-            check_complaint_status(request, complaint, now)
-    if not auction.lots and auction.status == 'active.tendering' and auction.tenderPeriod.endDate <= now:
+    check_complaints_status(request, auction, now)
+    if auction.status == 'active.tendering' and auction.tenderPeriod.endDate <= now:
         auction.status = 'active.auction'
-        remove_draft_bids(request)
-        remove_invalid_bids(request)
-        check_bids(request)
-        log_auction_status_change(request, auction, auction.status)
-        return True
-    elif auction.lots and auction.status == 'active.tendering' and auction.tenderPeriod.endDate <= now:
-        auction.status = 'active.auction'
-        remove_draft_bids(request)
-        remove_invalid_bids(request)
-        check_bids(request)
-        [setattr(i.auctionPeriod, 'startDate', None) for i in auction.lots if i.numberOfBids < 2 and i.auctionPeriod]
+        bids_count = prune_bids(request)
+        check_bids(request, bids_count['active'])
+        if auction.lots:
+            lot_bids = auction.bid_counters.lots
+            [setattr(i.auctionPeriod, 'startDate', None) for i in auction.lots if lot_bids.get(i.id, 0) < 2 and i.auctionPeriod]
         log_auction_status_change(request, auction, auction.status)
         return True
     elif not auction.lots and auction.status == 'active.awarded':
-        standStillEnds = [
-            a.complaintPeriod.endDate.astimezone(TZ)
-            for a in auction.awards
-            if a.complaintPeriod.endDate
-        ]
+        standStillEnds = index_stand_still_ends(auction.awards)
         if not standStillEnds:
             return
-        standStillEnd = max(standStillEnds)
+        standStillEnd = max(standStillEnds.values())
         if standStillEnd <= now:
             check_auction_status(request)
     elif auction.lots and auction.status in ['active.qualification', 'active.awarded']:
-        if any([i['status'] in auction.block_complaint_status and i.relatedLot is None for i in auction.complaints]):
+        if any(i['status'] in auction.block_complaint_status and i.relatedLot is None for i in auction.complaints):
             return
+        standStillEnds = index_stand_still_ends(auction.awards)
         for lot in auction.lots:
             if lot['status'] != 'active':
                 continue
-            lot_awards = [i for i in auction.awards if i.lotID == lot.id]
-            standStillEnds = [
-                a.complaintPeriod.endDate.astimezone(TZ)
-                for a in lot_awards
-                if a.complaintPeriod.endDate
-            ]
-            if not standStillEnds:
-                continue
-            standStillEnd = max(standStillEnds)
-            if standStillEnd <= now:
+            standStillEnd = standStillEnds.get(lot.id)
+            if standStillEnd and standStillEnd <= now:
                 check_auction_status(request)
                 return
 
@@ -123,12 +180,37 @@ def get_auction_creation_date(data):
     return auction_creation_date
 
 
-def remove_invalid_bids(request):
+def prune_bids(request, statuses=PRUNED_BID_STATUSES):
+    """Remove the bids in ``statuses`` in place, in a single pass.
+
+    Returns the number of bids found in each status (active, draft and
+    invalid at least), the active ones being the bids kept.
+    """
     auction = request.validated['auction']
-    if [bid for bid in auction.bids if getattr(bid, "status", "active") == "invalid"]:
-        LOGGER.info('Remove invalid bids',
-                    extra=context_unpack(request, {'MESSAGE_ID': 'remove_invalid_bids'}))
-        auction.bids = [bid for bid in auction.bids if getattr(bid, "status", "active") != "invalid"]
+    bids = auction.bids
+    bids_count = dict.fromkeys(('active',) + PRUNED_BID_STATUSES, 0)
+    kept = 0
+    for bid in bids:
+        status = getattr(bid, "status", "active")
+        bids_count[status] = bids_count.get(status, 0) + 1
+        if status not in statuses:
+            bids[kept] = bid
+            kept += 1
+    if kept < len(bids):
+        del bids[kept:]
+        for status in statuses:
+            if bids_count.get(status):
+                LOGGER.info('Remove {} bids'.format(status),
+                            extra=context_unpack(request, {'MESSAGE_ID': 'remove_{}_bids'.format(status)}))
+    return bids_count
+
+
+def remove_draft_bids(request):
+    return prune_bids(request, ('draft',))
+
+
+def remove_invalid_bids(request):
+    return prune_bids(request, ('invalid',))
 
 
 def invalidate_bids_data(auction):
@@ -137,12 +219,528 @@ def invalidate_bids_data(auction):
     auction.rectificationPeriod.invalidationDate = get_now()
 
 
+MANDATORY_ADDITIONAL_CLASSIFICATOR_KEY = (
+    MANDATORY_ADDITIONAL_CLASSIFICATOR['scheme'], MANDATORY_ADDITIONAL_CLASSIFICATOR['id']
+)
+_mandatory_additional_classificators = {}
+
+
+def get_mandatory_additional_classificator(model_class):
+    """Return the mandatory additional classificator as ``model_class`` data.
+
+    The template is converted by the model once per model class.
+    """
+    if model_class not in _mandatory_additional_classificators:
+        classificator = model_class(MANDATORY_ADDITIONAL_CLASSIFICATOR)
+        _mandatory_additional_classificators[model_class] = classificator.serialize()
+    return _mandatory_additional_classificators[model_class]
+
+
+def normalize_additional_classifications(items, model_class=None):
+    """Add the mandatory additional classificator to every item missing it.
+
+    Works on item models, or on item dicts of raw auction data when no
+    ``model_class`` is given (e.g. in migrations). Returns the number of
+    changed items.
+    """
+    classificator = None
+    changed = 0
+    for item in items:
+        classifications = item['additionalClassifications']
+        if MANDATORY_ADDITIONAL_CLASSIFICATOR_KEY in set((i['scheme'], i['id']) for i in classifications):
+            continue
+        if model_class is None:
+            classifications.append(dict(MANDATORY_ADDITIONAL_CLASSIFICATOR))
+        else:
+            if classificator is None:
+                classificator = model_class(get_mandatory_additional_classificator(model_class))
+            classifications.append(classificator)
+        changed += 1
+    return changed
+
+
 def append_additional_classificator(auction):
-    mandatory_additional_classificator = type(auction).items.model_class.additionalClassifications.model_class(
-        MANDATORY_ADDITIONAL_CLASSIFICATOR)
-    for item in auction['items']:
-        for additionalClassification in item['additionalClassifications']:
-            if (additionalClassification['scheme'] == MANDATORY_ADDITIONAL_CLASSIFICATOR['scheme'] and additionalClassification['id'] == MANDATORY_ADDITIONAL_CLASSIFICATOR['id']):
-                break
+    return normalize_additional_classifications(
+        auction['items'], type(auction).items.model_class.additionalClassifications.model_class
+    )
+
+
+def iter_auctions_by_next_check(registry, till, since=None):
+    """Yield (next_check, auction_id) of lease auctions due in a time window.
+
+    Rows come from the next_check view index ordered by next_check, so only
+    the auctions that should be woken up are read.
+    """
+    procurement_method_types = get_procurement_method_types(
+        registry, [DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE]
+    )
+    streams = []
+    for procurement_method_type in procurement_method_types:
+        options = {'endkey': [procurement_method_type, till.isoformat()]}
+        if since:
+            options['startkey'] = [procurement_method_type, since.isoformat()]
+        else:
+            options['startkey'] = [procurement_method_type]
+        rows = lease_auctions_by_next_check_view(registry.db, **options)
+        streams.append(((row.key[1], row.id) for row in rows))
+    return merge(*streams)
+
+
+def iter_auctions_planned_events(registry, since, till):
+    """Yield the events of lease auctions planned in a time window.
+
+    Every event is a dict with the auction id, the event name and date, the
+    auction status and the related lot or award id. Rows come from the
+    planned events view ordered by date, without reading any documents.
+    """
+    procurement_method_types = get_procurement_method_types(
+        registry, [DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE]
+    )
+    streams = []
+    for procurement_method_type in procurement_method_types:
+        rows = lease_auctions_by_planned_event_view(
+            registry.db,
+            startkey=[procurement_method_type, since.isoformat()],
+            endkey=[procurement_method_type, till.isoformat()],
+        )
+        streams.append(((row.key[1], row.id, row.value) for row in rows))
+    for date, auction_id, (event, status, related_id) in merge(*streams):
+        yield {
+            'id': auction_id,
+            'event': event,
+            'date': date,
+            'status': status,
+            'relatedItem': related_id,
+        }
+
+
+def get_planning_window(request):
+    """since and till query parameters of the planning view, None on errors."""
+    window = {}
+    for name in ('since', 'till'):
+        value = request.params.get(name)
+        if value is None:
+            continue
+        try:
+            window[name] = parse_date(value, TZ).astimezone(TZ)
+        except ParseError:
+            request.errors.add('params', name, 'Should be a date.')
+            request.errors.status = 422
+            return
+    since = window.get('since') or get_now()
+    till = window.get('till') or since + PLANNING_WINDOW
+    if till < since or till - since > PLANNING_MAX_WINDOW:
+        request.errors.add('params', 'till', 'Should be within {} days after since.'.format(PLANNING_MAX_WINDOW.days))
+        request.errors.status = 422
+        return
+    return since, till
+
+
+def get_decimal_param(request, name, maximum=None):
+    """Non-negative decimal query parameter ``name``, None when it is absent.
+
+    Invalid values are added to the request errors and raised.
+    """
+    value = request.params.get(name)
+    if value is None:
+        return
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite() or value < 0 or (maximum is not None and value > maximum):
+        if maximum is None:
+            request.errors.add('params', name, 'Should be a non-negative number.')
+        else:
+            request.errors.add('params', name, 'Should be a number from 0 to {}.'.format(maximum))
+        request.errors.status = 422
+        raise error_handler(request)
+    return value
+
+
+class BulkDocsCollector(object):
+    """Database stand-in that collects documents stored by save_auction.
+
+    The collected documents are written afterwards with a single
+    ``_bulk_docs`` request instead of one request per auction. ``results``
+    holds the per-item result of every collected document, by position.
+    """
+
+    def __init__(self):
+        self.docs = []
+        self.results = []
+
+    def save(self, doc):
+        self.docs.append(doc)
+        return doc['_id'], doc.get('_rev')
+
+
+def check_auction_updatable(request, auction):
+    """Refuse updates of auctions in a terminal status to all but the Administrator."""
+    if request.authenticated_role != 'Administrator' and auction.status in TERMINAL_AUCTION_STATUSES:
+        request.errors.add('body', 'data', 'Can\'t update auction in current ({}) status'.format(auction.status))
+        request.errors.status = 403
+        return False
+    return True
+
+
+def set_auction_context(request, auction, src=None):
+    """Point the request at another auction when processing many at once.
+
+    ``src`` is the revision source of save_auction, the serialized auction
+    by default.
+    """
+    request.auction = auction
+    request.validated['auction'] = auction
+    request.validated['auction_id'] = auction.id
+    request.validated['auction_status'] = auction.status
+    request.validated['auction_src'] = auction.serialize('plain') if src is None else src
+    request.content_configurator = request.registry.queryMultiAdapter(
+        (auction, request), IContentConfigurator
+    )
+
+
+def collect_auction(request, collector, result):
+    """Run save_auction for the current auction without writing it.
+
+    The auction is stored into ``collector`` through its
+    ``bulk_docs_collector``, see Auction.store.
+    """
+    auction = request.validated['auction']
+    collected = len(collector.docs)
+    auction.bulk_docs_collector = collector
+    try:
+        return save_auction(request)
+    finally:
+        auction.bulk_docs_collector = None
+        collector.results.extend([result] * (len(collector.docs) - collected))
+
+
+def pop_request_errors(request):
+    errors = [{'location': i['location'], 'name': i['name'], 'description': i['description']}
+              for i in request.errors]
+    del request.errors[:]
+    request.errors.status = 400
+    return errors
+
+
+def write_bulk_docs(request, collector):
+    """Write collected documents in one request and update per-item results.
+
+    CouchDB answers ``_bulk_docs`` in the order of the documents, so the
+    answers are matched to the collected results by position.
+    """
+    if not collector.docs:
+        return
+    answers = request.registry.db.update(collector.docs)
+    for result, (success, doc_id, rev_or_exc) in zip(collector.results, answers):
+        if success:
+            result['rev'] = rev_or_exc
+            continue
+        if 'updated' in result:
+            result['updated'] = False
+        result['errors'] = [{'location': 'body', 'name': 'data', 'description': str(rev_or_exc)}]
+        LOGGER.error('Failed bulk update of auction {}: {}'.format(doc_id, rev_or_exc),
+                     extra=context_unpack(request, {'MESSAGE_ID': 'bulk_update_failed'}, {'AUCTION_ID': doc_id}))
+
+
+def check_auctions_status(request, auction_ids):
+    """Run the chronograph checks for many lease auctions at once.
+
+    Every auction goes through check_status (which removes draft and invalid
+    bids and runs check_bids when the tender period is over) and through the
+    regular save_auction revision logic. The auctions are read with a single
+    ``_all_docs`` request and all changed documents are written back with a
+    single ``_bulk_docs`` call. As with a single PATCH, auctions in a
+    terminal status are not updated.
+    """
+    db = request.registry.db
+    root = Root(request)
+    collector = BulkDocsCollector()
+    results = []
+    rows = db.view('_all_docs', keys=list(auction_ids), include_docs=True) if auction_ids else []
+    docs = dict((row['key'], row.get('doc')) for row in rows)
+    for auction_id in auction_ids:
+        result = {'id': auction_id, 'updated': False}
+        results.append(result)
+        doc = docs.get(auction_id)
+        model = doc and doc.get('doc_type') == 'Auction' and \
+            request.registry.auction_procurementMethodTypes.get(doc.get('procurementMethodType'))
+        if not model or model._internal_type != DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE:
+            result['errors'] = [{'location': 'url', 'name': 'auction_id', 'description': 'Not Found'}]
+            continue
+        saved_docs = len(collector.docs)
+        try:
+            auction = model(doc)
+            auction.__parent__ = root
+            set_auction_context(request, auction)
+            if check_auction_updatable(request, auction):
+                check_status(request)
+                collect_auction(request, collector, result)
+        except (ModelValidationError, ModelConversionError), e:
+            del collector.docs[saved_docs:]
+            del collector.results[saved_docs:]
+            for i in e.message:
+                request.errors.add('body', i, e.message[i])
+            LOGGER.error('Failed chronograph check of auction {}: {}'.format(auction_id, e.message),
+                         extra=context_unpack(request, {'MESSAGE_ID': 'bulk_check_failed'}, {'AUCTION_ID': auction_id}))
+        if request.errors:
+            result['errors'] = pop_request_errors(request)
+            continue
+        result['updated'] = len(collector.docs) > saved_docs
+        result['status'] = auction.status
+        result['next_check'] = auction.next_check
+    write_bulk_docs(request, collector)
+    return results
+
+
+def build_auction(request, data, root):
+    """Validate the data of a new lease auction the way POST /auctions does."""
+    model = isinstance(data, dict) and \
+        request.registry.auction_procurementMethodTypes.get(data.get('procurementMethodType'))
+    if not model or model._internal_type != DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE:
+        request.errors.add('body', 'data', 'procurementMethodType is not implemented')
+        return
+    try:
+        auction = model(data)
+        auction.__parent__ = root
+        auction.validate()
+        auction = model(auction.serialize('create'))
+        auction.__parent__ = root
+    except (ModelValidationError, ModelConversionError), e:
+        for i in e.message:
+            request.errors.add('body', i, e.message[i])
+        return
+    return auction
+
+
+def create_auctions(request, items):
+    """Create many lease auctions at once.
+
+    Every auction is validated and goes through the regular
+    ``create_auction`` of its manager and save_auction revision logic.
+    All valid auctions are written with a single ``_bulk_docs`` call and
+    invalid ones are reported by their position.
+
+    auctionID is generated per auction by the core counter, which keeps
+    its daily sequence in the database with conflict retries. As with a
+    single POST, an ID is taken before the write and left unused when the
+    write fails.
+    """
+    db = request.registry.db
+    root = Root(request)
+    collector = BulkDocsCollector()
+    results = []
+    for data in items:
+        result = {}
+        results.append(result)
+        auction = build_auction(request, data, root)
+        if auction is not None:
+            auction.id = generate_id()
+            # a new auction is saved with all of its data as changes
+            set_auction_context(request, auction, src={})
+            request.registry.getAdapter(auction, IAuctionManager).create_auction(request)
+        collected = len(collector.docs)
+        if not request.errors:
+            auction.auctionID = generate_auction_id(get_now(), db, request.registry.server_id)
+            set_ownership(auction, request)
+            result.update({
+                'id': auction.id,
+                'auctionID': auction.auctionID,
+                'status': auction.status,
+                'access': {'token': auction.owner_token},
+            })
+            collect_auction(request, collector, result)
+        if request.errors:
+            del collector.docs[collected:]
+            del collector.results[collected:]
+            result.clear()
+            result['errors'] = pop_request_errors(request)
+    write_bulk_docs(request, collector)
+    for result in results:
+        if 'errors' in result:
+            errors = result.pop('errors')
+            result.clear()
+            result['errors'] = errors
+    return results
+
+
+def get_requested_fields(request):
+    """Fields requested with ``opt_fields`` (or ``fields``), None for all."""
+    fields = request.params.get('opt_fields') or request.params.get('fields')
+    if fields:
+        return set(i.strip() for i in fields.split(',') if i.strip()) | set(['id'])
+
+
+def serialize_fields(model, role, fields):
+    """Serialize only the requested top-level fields of a model for a role.
+
+    Unrequested subtrees (bids, documents, contract terms, ...) and
+    serializable properties are not walked at all.
+    """
+    cls = type(model)
+    roles = cls._options.roles
+    if role in roles:
+        gottago = roles[role]
+    elif 'default' in roles:
+        gottago = roles['default']
+    else:
+        gottago = lambda name, value: False
+
+    def to_primitive(field, value):
+        return field.to_primitive(value)
+
+    data = {}
+    for name, field in chain(cls._fields.items(), cls._serializables.items()):
+        serialized_name = field.serialized_name or name
+        if serialized_name not in fields:
+            continue
+        value = getattr(model, name)
+        if value is None or gottago(name, value):
+            continue
+        if hasattr(field, 'export_loop'):
+            shaped = field.export_loop(value, to_primitive, role=role)
         else:
-            item['additionalClassifications'].append(mandatory_additional_classificator)
+            shaped = to_primitive(field, value)
+        if shaped is not None:
+            data[serialized_name] = shaped
+    return data
+
+
+def get_auction_etag(request):
+    """Strong ETag of the representation of an auction resource.
+
+    Any change of an auction or of its subresources gives the document a new
+    revision. The representation also depends on the role, on the resource
+    path with its query (``opt_fields``, subresources) and on
+    ``shouldStartAfter``, which is computed from the current time and changes
+    without a new revision. ``next_check`` is left out, so answering with
+    304 does not compute it; it is a hint for the chronograph, which does not
+    send conditional requests.
+    """
+    auction = request.validated['auction']
+    auction_period = auction.auctionPeriod
+    return md5(u'{}:{}:{}:{}'.format(
+        auction.rev,
+        request.authenticated_role,
+        request.path_qs,
+        auction_period and auction_period.shouldStartAfter,
+    ).encode('utf-8')).hexdigest()
+
+
+def is_not_modified(request):
+    """Answer conditional GET requests for auction resources.
+
+    When the ETag of the client copy is the current one, the response is
+    switched to ``304 Not Modified`` and True is returned so the view can
+    skip the serialization. Last-Modified follows dateModified, but
+    If-Modified-Since is not enough to answer 304 as the representation
+    also changes with time.
+    """
+    auction = request.validated['auction']
+    response = request.response
+    response.etag = get_auction_etag(request)
+    if auction.dateModified:
+        response.last_modified = auction.dateModified
+    if response.etag in request.if_none_match:
+        response.status = 304
+        return True
+    return False
+
+
+class DocumentVersions(object):
+    """Versions of documents grouped by document id in a single pass."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.by_id = {}
+        for document in documents:
+            self.by_id.setdefault(document.id, []).append(document)
+
+    def latest(self):
+        """The last version of every document ordered by dateModified."""
+        return sorted(
+            (versions[-1] for versions in self.by_id.itervalues()),
+            key=lambda i: i.dateModified.isoformat()
+        )
+
+    def versions(self, document_id):
+        return self.by_id.get(document_id, [])
+
+
+def get_document_versions(request, documents):
+    """DocumentVersions of a documents list, built once per request."""
+    indexes = request.validated.setdefault('document_versions', {})
+    key = id(documents)
+    if key not in indexes or indexes[key].documents is not documents:
+        indexes[key] = DocumentVersions(documents)
+    return indexes[key]
+
+
+def get_listing_paging(request):
+    """offset and limit query parameters of a listing, None on errors."""
+    paging = {'offset': 0, 'limit': None}
+    for name, minimum in (('offset', 0), ('limit', 1)):
+        value = request.params.get(name)
+        if value is None:
+            continue
+        if not value.isdigit() or int(value) < minimum:
+            request.errors.add('params', name, 'Should be a non-negative integer.' if not minimum
+                               else 'Should be a positive integer.')
+            request.errors.status = 422
+            return
+        paging[name] = int(value)
+    return paging
+
+
+def iter_listing_json(items, next_page=None):
+    """Encode a listing chunk by chunk so it never lives in memory as a whole."""
+    yield '{"data": ['
+    for index, item in enumerate(items):
+        yield (', ' if index else '') + dumps(item)
+    yield ']'
+    if next_page:
+        yield ', "next_page": ' + dumps(next_page)
+    yield '}'
+
+
+def documents_listing(request, documents):
+    """Documents listing: all versions with ``all``, the latest ones otherwise.
+
+    ``offset``/``limit`` select a page and ``next_page`` points to the next
+    one. Listings of all versions are streamed: documents are serialized and
+    written one at a time from the response ``app_iter``.
+    """
+    paging = get_listing_paging(request)
+    if paging is None:
+        return
+    show_all = request.params.get('all', '')
+    if show_all:
+        selected = documents
+    else:
+        selected = get_document_versions(request, documents).latest()
+    offset, limit = paging['offset'], paging['limit']
+    next_page = None
+    if limit is not None and offset + limit < len(selected):
+        next_page = {'offset': offset + limit}
+    page = islice(selected, offset, None if limit is None else offset + limit)
+    serialized = (i.serialize("view") for i in page)
+    if not show_all:
+        data = {'data': list(serialized)}
+        if next_page:
+            data['next_page'] = next_page
+        return data
+    response = request.response
+    response.content_type = 'application/json'
+    response.app_iter = iter_listing_json(serialized, next_page)
+    return response
+
+
+def serialize_previous_versions(request, document, documents, predicate=None):
+    """Serialize the versions of document that differ from it."""
+    predicate = predicate or (lambda i: i.url != document.url)
+    return [
+        i.serialize("view")
+        for i in get_document_versions(request, documents).versions(document.id)
+        if predicate(i)
+    ]
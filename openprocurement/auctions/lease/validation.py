@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+from schematics.exceptions import ModelConversionError, ModelValidationError
+
+from openprocurement.api.validation import validate_json_data
 from openprocurement.auctions.core.utils import (
     TZ,
     error_handler,
@@ -6,6 +9,8 @@ from openprocurement.auctions.core.utils import (
     get_now,
 )
 
+from openprocurement.auctions.lease.constants import DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE
+
 
 def validate_rectification_period_editing(request, **kwargs):
     if request.context.status == 'active.tendering' and request.authenticated_role not in ['chronograph', 'Administrator']:
@@ -15,3 +20,125 @@ def validate_rectification_period_editing(request, **kwargs):
             request.errors.add('body', 'data', 'Auction can be edited only during the rectification period: from ({}) to ({}).'.format(rectificationPeriod.startDate.isoformat(), rectificationPeriod.endDate.isoformat()))
             request.errors.status = 403
             raise error_handler(request)
+
+
+def validate_auctions_chronograph_data(request, **kwargs):
+    if request.authenticated_role != 'chronograph':
+        request.errors.add('url', 'role', 'Forbidden')
+        request.errors.status = 403
+        raise error_handler(request)
+    data = validate_json_data(request)
+    auction_ids = data.get('ids')
+    if not isinstance(auction_ids, list) or not auction_ids or \
+            not all(isinstance(i, basestring) for i in auction_ids):
+        request.errors.add('body', 'ids', 'Please provide a non-empty list of auction ids.')
+        request.errors.status = 422
+        raise error_handler(request)
+    seen = set()
+    request.validated['auction_ids'] = [i for i in auction_ids if not (i in seen or seen.add(i))]
+
+
+def validate_bid_accreditation(request):
+    """Accreditation checks of bid creation, as in the single bid POST."""
+    auction = request.validated['auction']
+    levels = request.registry.accreditation['auction'][DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE]['edit']
+    if not any(request.check_accreditation(level) for level in levels):
+        request.errors.add('procurementMethodType', 'accreditation', 'Broker Accreditation level does not permit bid creation')
+        request.errors.status = 403
+        raise error_handler(request)
+    if auction.get('mode', None) is None and request.check_accreditation('t'):
+        request.errors.add('procurementMethodType', 'mode', 'Broker Accreditation level does not permit bid creation')
+        request.errors.status = 403
+        raise error_handler(request)
+
+
+def validate_bids_bulk_data(request, **kwargs):
+    validate_bid_accreditation(request)
+    data = validate_json_data(request)
+    items = data.get('bids')
+    if not isinstance(items, list) or not items:
+        request.errors.add('body', 'bids', 'Please provide a non-empty list of bids.')
+        request.errors.status = 422
+        raise error_handler(request)
+    auction = request.validated['auction']
+    model = type(auction).bids.model_class
+    bids, errors = [], []
+    for item in items:
+        try:
+            if not isinstance(item, dict):
+                raise ModelConversionError({'data': [u'Data not available']})
+            bid = model(item)
+            bid.__parent__ = auction
+            bid.validate()
+            documents = bid.documents
+            bid = model(bid.serialize('create'))
+            bid.__parent__ = auction
+            bid.documents = documents
+        except (ModelValidationError, ModelConversionError), e:
+            errors.append(e.message)
+        else:
+            errors.append({})
+            bids.append(bid)
+    if any(errors):
+        request.errors.add('body', 'bids', errors)
+        request.errors.status = 422
+        raise error_handler(request)
+    request.validated['bids'] = bids
+
+
+def validate_bids_bulk_status_data(request, **kwargs):
+    """Bids and statuses of a bulk bid PATCH.
+
+    Every bid is checked the way its own PATCH is: brokers need to own
+    the bid and give its token, and may only keep the status or activate
+    the bid, while the Administrator may set any status.
+    """
+    data = validate_json_data(request)
+    items = data.get('bids')
+    if not isinstance(items, list) or not items:
+        request.errors.add('body', 'bids', 'Please provide a non-empty list of bids.')
+        request.errors.status = 422
+        raise error_handler(request)
+    is_administrator = request.authenticated_role == 'Administrator'
+    bids = dict((bid.id, bid) for bid in request.validated['auction'].bids)
+    changes, errors = [], []
+    for item in items:
+        item = item if isinstance(item, dict) else {}
+        bid = bids.get(item.get('id'))
+        if bid is None:
+            errors.append({'id': [u'Bid not found']})
+            continue
+        if not is_administrator and (bid.owner != request.authenticated_userid or item.get('token') != bid.owner_token):
+            request.errors.add('url', 'permission', 'Forbidden')
+            request.errors.status = 403
+            raise error_handler(request)
+        if not is_administrator and item.get('status') not in (bid.status, 'active'):
+            errors.append({'status': [u'Can\'t update bid to ({}) status'.format(item.get('status'))]})
+        else:
+            errors.append({})
+            changes.append((bid, item.get('status', bid.status)))
+    if any(errors):
+        request.errors.add('body', 'bids', errors)
+        request.errors.status = 422
+        raise error_handler(request)
+    request.validated['bids_status'] = changes
+
+
+def validate_auctions_bulk_data(request, **kwargs):
+    data = validate_json_data(request)
+    items = data.get('auctions')
+    if not isinstance(items, list) or not items:
+        request.errors.add('body', 'auctions', 'Please provide a non-empty list of auctions.')
+        request.errors.status = 422
+        raise error_handler(request)
+    levels = request.registry.accreditation['auction'][DEFAULT_PROCUREMENT_METHOD_TYPE_LEASE]['create']
+    if not any(request.check_accreditation(level) for level in levels):
+        request.errors.add('procurementMethodType', 'accreditation', 'Broker Accreditation level does not permit auction creation')
+        request.errors.status = 403
+        raise error_handler(request)
+    if request.check_accreditation('t') and \
+            any(not isinstance(i, dict) or i.get('mode', None) is None for i in items):
+        request.errors.add('procurementMethodType', 'mode', 'Broker Accreditation level does not permit auction creation')
+        request.errors.status = 403
+        raise error_handler(request)
+    request.validated['auctions_data'] = items
@@ -190,7 +190,7 @@ class AuctionAuctionResource(APIResource):
         apply_patch(self.request, save=False, src=self.request.validated['auction_src'])
         auction = self.request.validated['auction']
         adapter = self.request.registry.getAdapter(auction, IAuctionManager)
-        if all([i.auctionPeriod and i.auctionPeriod.endDate for i in auction.lots if i.numberOfBids > 1 and i.status == 'active']):
+        if all([i.auctionPeriod and i.auctionPeriod.endDate for i in auction.lots if auction.bid_counters.lots.get(i.id, 0) > 1 and i.status == 'active']):
             cleanup_bids_for_cancelled_lots(auction)
             invalidate_bids_under_threshold(auction)
             if any([i.status == 'active' for i in auction.bids]):
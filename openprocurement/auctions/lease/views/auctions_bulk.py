@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from cornice.resource import resource
+
+from openprocurement.auctions.core.traversal import Root
+from openprocurement.auctions.core.utils import (
+    APIResource,
+    context_unpack,
+    error_handler,
+    json_view,
+)
+
+from openprocurement.auctions.lease.utils import create_auctions
+from openprocurement.auctions.lease.validation import (
+    validate_auctions_bulk_data,
+)
+
+
+@resource(name='propertyLease:Auctions Bulk',
+          path='/auctions/lease/bulk',
+          factory=Root,
+          error_handler=error_handler,
+          description="Bulk creation of lease auctions")
+class AuctionsBulkResource(APIResource):
+
+    @json_view(content_type="application/json", validators=(validate_auctions_bulk_data,), permission='create_auction')
+    def post(self):
+        """Create many lease auctions at once
+
+        Every auction is validated and created like with ``POST /auctions``.
+        Valid auctions are saved in one bulk request, invalid ones are
+        reported by their position in the list.
+
+        .. sourcecode:: http
+
+            POST /auctions/lease/bulk HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+            {
+                "data": {
+                    "auctions": [
+                        {
+                            "procurementMethodType": "propertyLease",
+                            "auctionPeriod": {"startDate": "2018-04-10T10:00:00+03:00"},
+                            ...
+                        },
+                        {
+                            "procurementMethodType": "propertyLease",
+                            ...
+                        }
+                    ]
+                }
+            }
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 201 Created
+            Content-Type: application/json
+
+            {
+                "data": [
+                    {
+                        "id": "64e93250be76435397e8c992ed4214d1",
+                        "auctionID": "UA-PS-2018-04-02-000001",
+                        "status": "active.tendering",
+                        "rev": "1-a7b53ac14d554e3f9ce6d9f1c0cf2d31",
+                        "access": {"token": "0fc58c83963d42a692db4987df86640a"}
+                    },
+                    {
+                        "errors": [
+                            {"location": "body", "name": "items", "description": ["This field is required."]}
+                        ]
+                    }
+                ]
+            }
+
+        """
+        results = create_auctions(self.request, self.request.validated['auctions_data'])
+        self.LOGGER.info('Created {} of {} auctions'.format(len([i for i in results if 'rev' in i]), len(results)),
+                         extra=context_unpack(self.request, {'MESSAGE_ID': 'auctions_bulk_create'}))
+        self.request.response.status = 201
+        return {'data': results}
@@ -13,6 +13,15 @@ from openprocurement.auctions.core.validation import (
     validate_bid_data,
     validate_patch_bid_data,
 )
+from schematics.exceptions import ModelValidationError
+
+from openprocurement.auctions.lease.utils import (
+    is_not_modified,
+)
+from openprocurement.auctions.lease.validation import (
+    validate_bids_bulk_data,
+    validate_bids_bulk_status_data,
+)
 
 
 @opresource(name='propertyLease:Auction Bids',
@@ -170,6 +179,8 @@ class AuctionBidResource(APIResource):
             self.request.errors.add('body', 'data', 'Can\'t view bids in current ({}) auction status'.format(self.request.validated['auction_status']))
             self.request.errors.status = 403
             return
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': [i.serialize(self.request.validated['auction_status']) for i in auction.bids]}
 
     @json_view(permission='view_auction')
@@ -202,12 +213,14 @@ class AuctionBidResource(APIResource):
             }
 
         """
-        if self.request.authenticated_role == 'bid_owner':
-            return {'data': self.request.context.serialize('view')}
-        if self.request.validated['auction_status'] in ['active.tendering', 'active.auction']:
+        if self.request.authenticated_role != 'bid_owner' and self.request.validated['auction_status'] in ['active.tendering', 'active.auction']:
             self.request.errors.add('body', 'data', 'Can\'t view bid in current ({}) auction status'.format(self.request.validated['auction_status']))
             self.request.errors.status = 403
             return
+        if is_not_modified(self.request):
+            return self.request.response
+        if self.request.authenticated_role == 'bid_owner':
+            return {'data': self.request.context.serialize('view')}
         return {'data': self.request.context.serialize(self.request.validated['auction_status'])}
 
     @json_view(content_type="application/json", permission='edit_bid', validators=(validate_patch_bid_data,))
@@ -325,3 +338,133 @@ class AuctionBidResource(APIResource):
             self.LOGGER.info('Deleted auction bid {}'.format(self.request.context.id),
                         extra=context_unpack(self.request, {'MESSAGE_ID': 'auction_bid_delete'}))
             return {'data': res}
+
+
+@opresource(name='propertyLease:Auction Bids Bulk',
+            path='/auctions/{auction_id}/bids_bulk',
+            auctionsprocurementMethodType="propertyLease",
+            description="Auction bids bulk submission")
+class AuctionBidsBulkResource(APIResource):
+
+    @json_view(content_type="application/json", permission='create_bid', validators=(validate_bids_bulk_data,))
+    def post(self):
+        """Registration of many bid proposals at once
+
+        All bids are validated before any of them is added, and the auction
+        is saved once. Either every bid is registered or none is.
+
+        .. sourcecode:: http
+
+            POST /auctions/4879d3f8ee2443169b5fbbc9f89fa607/bids_bulk HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+            {
+                "data": {
+                    "bids": [
+                        {
+                            "tenderers": [...],
+                            "value": {"amount": 489}
+                        },
+                        {
+                            "tenderers": [...],
+                            "value": {"amount": 500}
+                        }
+                    ]
+                }
+            }
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 201 Created
+            Content-Type: application/json
+
+            {
+                "data": [
+                    {"id": "4879d3f8ee2443169b5fbbc9f89fa607", "status": "active", ...},
+                    {"id": "ddd45992f1c545b9b03302205962265b", "status": "active", ...}
+                ],
+                "access": [
+                    {"id": "4879d3f8ee2443169b5fbbc9f89fa607", "token": "..."},
+                    {"id": "ddd45992f1c545b9b03302205962265b", "token": "..."}
+                ]
+            }
+
+        """
+        auction = self.request.validated['auction']
+        if self.request.validated['auction_status'] != 'active.tendering':
+            self.request.errors.add('body', 'data', 'Can\'t add bid in current ({}) auction status'.format(self.request.validated['auction_status']))
+            self.request.errors.status = 403
+            return
+        if auction.tenderPeriod.startDate and get_now() < auction.tenderPeriod.startDate or get_now() > auction.tenderPeriod.endDate:
+            self.request.errors.add('body', 'data', 'Bid can be added only during the tendering period: from ({}) to ({}).'.format(auction.tenderPeriod.startDate and auction.tenderPeriod.startDate.isoformat(), auction.tenderPeriod.endDate.isoformat()))
+            self.request.errors.status = 403
+            return
+        bids = self.request.validated['bids']
+        for bid in bids:
+            set_ownership(bid, self.request)
+            auction.bids.append(bid)
+        auction.modified = False
+        if save_auction(self.request):
+            self.LOGGER.info('Created auction bids {}'.format(', '.join(bid.id for bid in bids)),
+                        extra=context_unpack(self.request, {'MESSAGE_ID': 'auction_bid_bulk_create'}))
+            self.request.response.status = 201
+            return {
+                'data': [bid.serialize('view') for bid in bids],
+                'access': [{'id': bid.id, 'token': bid.owner_token} for bid in bids]
+            }
+
+    @json_view(content_type="application/json", permission='create_bid', validators=(validate_bids_bulk_status_data,))
+    def patch(self):
+        """Update of many bid statuses at once
+
+        Every item carries the token of a bid owned by the broker, as for
+        the PATCH of a single bid. Brokers can only move bids to ``active``
+        status, and the auction is saved once.
+
+        .. sourcecode:: http
+
+            PATCH /auctions/4879d3f8ee2443169b5fbbc9f89fa607/bids_bulk HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+            {
+                "data": {
+                    "bids": [
+                        {"id": "4879d3f8ee2443169b5fbbc9f89fa607", "token": "...", "status": "active"},
+                        {"id": "ddd45992f1c545b9b03302205962265b", "token": "...", "status": "active"}
+                    ]
+                }
+            }
+
+        """
+        auction = self.request.validated['auction']
+        if self.request.authenticated_role != 'Administrator' and self.request.validated['auction_status'] != 'active.tendering':
+            self.request.errors.add('body', 'data', 'Can\'t update bid in current ({}) auction status'.format(self.request.validated['auction_status']))
+            self.request.errors.status = 403
+            return
+        if self.request.authenticated_role != 'Administrator' and (auction.tenderPeriod.startDate and get_now() < auction.tenderPeriod.startDate or get_now() > auction.tenderPeriod.endDate):
+            self.request.errors.add('body', 'data', 'Bid can be updated only during the tendering period: from ({}) to ({}).'.format(auction.tenderPeriod.startDate and auction.tenderPeriod.startDate.isoformat(), auction.tenderPeriod.endDate.isoformat()))
+            self.request.errors.status = 403
+            return
+        changes = self.request.validated['bids_status']
+        errors = []
+        for bid, status in changes:
+            bid.status = status
+            try:
+                bid.validate()
+            except ModelValidationError, e:
+                errors.append(e.message)
+            else:
+                errors.append({})
+        if any(errors):
+            self.request.errors.add('body', 'bids', errors)
+            self.request.errors.status = 422
+            return
+        auction.modified = False
+        if save_auction(self.request):
+            self.LOGGER.info('Updated auction bids {}'.format(', '.join(bid.id for bid, _ in changes)),
+                        extra=context_unpack(self.request, {'MESSAGE_ID': 'auction_bid_bulk_patch'}))
+            return {'data': [bid.serialize('view') for bid, _ in changes]}
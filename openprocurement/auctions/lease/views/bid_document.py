@@ -17,6 +17,12 @@ from openprocurement.auctions.core.validation import (
     validate_patch_document_data,
 )
 
+from openprocurement.auctions.lease.utils import (
+    documents_listing,
+    is_not_modified,
+    serialize_previous_versions,
+)
+
 
 @opresource(name='propertyLease:Auction Bid Documents',
             collection_path='/auctions/{auction_id}/bids/{bid_id}/documents',
@@ -48,14 +54,9 @@ class AuctionBidDocumentResource(APIResource):
             self.request.errors.add('body', 'data', 'Can\'t view bid documents in current ({}) auction status'.format(self.request.validated['auction_status']))
             self.request.errors.status = 403
             return
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in self.context.documents]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in self.context.documents
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        if is_not_modified(self.request):
+            return self.request.response
+        return documents_listing(self.request, self.context.documents)
 
     @json_view(validators=(validate_file_upload,), permission='edit_bid')
     def collection_post(self):
@@ -84,13 +85,13 @@ class AuctionBidDocumentResource(APIResource):
             return
         if self.request.params.get('download'):
             return get_file(self.request)
+        if is_not_modified(self.request):
+            return self.request.response
         document = self.request.validated['document']
         document_data = document.serialize("view")
-        document_data['previousVersions'] = [
-            i.serialize("view")
-            for i in self.request.validated['documents']
-            if i.url != document.url
-        ]
+        document_data['previousVersions'] = serialize_previous_versions(
+            self.request, document, self.request.validated['bid'].documents
+        )
         return {'data': document_data}
 
     @json_view(validators=(validate_file_update,), permission='edit_bid')
@@ -14,6 +14,10 @@ from openprocurement.auctions.core.validation import (
 )
 from openprocurement.auctions.core.interfaces import IAuctionManager
 
+from openprocurement.auctions.lease.utils import (
+    is_not_modified,
+)
+
 
 @opresource(name='propertyLease:Auction Cancellations',
             collection_path='/auctions/{auction_id}/cancellations',
@@ -45,8 +49,8 @@ class AuctionCancellationResource(APIResource):
             adapter.pendify_auction_status('complete')
         if auction.status == 'active.auction' and all([
             i.auctionPeriod and i.auctionPeriod.endDate
-            for i in self.request.validated['auction'].lots
-            if i.numberOfBids > 1 and i.status == 'active'
+            for i in auction.lots
+            if auction.bid_counters.lots.get(i.id, 0) > 1 and i.status == 'active'
         ]):
             self.request.content_configurator.start_awarding()
 
@@ -82,12 +86,16 @@ class AuctionCancellationResource(APIResource):
     def collection_get(self):
         """List cancellations
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': [i.serialize("view") for i in self.request.validated['auction'].cancellations]}
 
     @json_view(permission='view_auction')
     def get(self):
         """Retrieving the cancellation
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': self.request.validated['cancellation'].serialize("view")}
 
     @json_view(content_type="application/json", validators=(validate_patch_cancellation_data,), permission='edit_auction')
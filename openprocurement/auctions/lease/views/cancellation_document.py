@@ -16,6 +16,12 @@ from openprocurement.auctions.core.validation import (
     validate_patch_document_data,
 )
 
+from openprocurement.auctions.lease.utils import (
+    documents_listing,
+    is_not_modified,
+    serialize_previous_versions,
+)
+
 
 @opresource(name='propertyLease:Auction Cancellation Documents',
             collection_path='/auctions/{auction_id}/cancellations/{cancellation_id}/documents',
@@ -27,14 +33,9 @@ class AuctionCancellationDocumentResource(APIResource):
     @json_view(permission='view_auction')
     def collection_get(self):
         """Auction Cancellation Documents List"""
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in self.context.documents]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in self.context.documents
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        if is_not_modified(self.request):
+            return self.request.response
+        return documents_listing(self.request, self.context.documents)
 
     @json_view(validators=(validate_file_upload,), permission='edit_auction')
     def collection_post(self):
@@ -59,13 +60,13 @@ class AuctionCancellationDocumentResource(APIResource):
         """Auction Cancellation Document Read"""
         if self.request.params.get('download'):
             return get_file(self.request)
+        if is_not_modified(self.request):
+            return self.request.response
         document = self.request.validated['document']
         document_data = document.serialize("view")
-        document_data['previousVersions'] = [
-            i.serialize("view")
-            for i in self.request.validated['documents']
-            if i.url != document.url
-        ]
+        document_data['previousVersions'] = serialize_previous_versions(
+            self.request, document, self.request.validated['cancellation'].documents
+        )
         return {'data': document_data}
 
     @json_view(validators=(validate_file_update,), permission='edit_auction')
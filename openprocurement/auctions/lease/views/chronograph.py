@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from cornice.resource import resource
+
+from openprocurement.auctions.core.traversal import Root
+from openprocurement.auctions.core.utils import (
+    APIResource,
+    context_unpack,
+    error_handler,
+    json_view,
+)
+
+from openprocurement.auctions.lease.utils import check_auctions_status
+from openprocurement.auctions.lease.validation import (
+    validate_auctions_chronograph_data,
+)
+
+
+@resource(name='propertyLease:Auctions Chronograph',
+          path='/auctions/lease/chronograph',
+          factory=Root,
+          error_handler=error_handler,
+          description="Bulk chronograph checks for lease auctions")
+class AuctionsChronographResource(APIResource):
+
+    @json_view(content_type="application/json", validators=(validate_auctions_chronograph_data,), permission='edit_auction')
+    def post(self):
+        """Check many auctions at once
+
+        Runs the same checks as a chronograph ``PATCH /auctions/{id}`` for
+        every auction in the list and writes all the changes back in one
+        bulk request.
+
+        .. sourcecode:: http
+
+            POST /auctions/lease/chronograph HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+            {
+                "data": {
+                    "ids": [
+                        "64e93250be76435397e8c992ed4214d1",
+                        "4879d3f8ee2443169b5fbbc9f89fa607"
+                    ]
+                }
+            }
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 200 OK
+            Content-Type: application/json
+
+            {
+                "data": [
+                    {
+                        "id": "64e93250be76435397e8c992ed4214d1",
+                        "updated": true,
+                        "rev": "3-a7b53ac14d554e3f9ce6d9f1c0cf2d31",
+                        "status": "active.auction",
+                        "next_check": "2014-11-06T10:00:00+02:00"
+                    },
+                    {
+                        "id": "4879d3f8ee2443169b5fbbc9f89fa607",
+                        "updated": false,
+                        "status": "active.tendering",
+                        "next_check": "2014-11-10T20:00:00+02:00"
+                    }
+                ]
+            }
+
+        """
+        results = check_auctions_status(self.request, self.request.validated['auction_ids'])
+        self.LOGGER.info('Checked {} auctions, updated {}'.format(len(results), len([i for i in results if i['updated']])),
+                         extra=context_unpack(self.request, {'MESSAGE_ID': 'auctions_chronograph_bulk'}))
+        return {'data': results}
@@ -15,6 +15,10 @@ from openprocurement.auctions.core.validation import (
     validate_patch_complaint_data,
 )
 
+from openprocurement.auctions.lease.utils import (
+    is_not_modified,
+)
+
 
 @opresource(name='propertyLease:Auction Complaints',
             collection_path='/auctions/{auction_id}/complaints',
@@ -58,12 +62,16 @@ class AuctionComplaintResource(APIResource):
     def collection_get(self):
         """List complaints
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': [i.serialize("view") for i in self.context.complaints]}
 
     @json_view(permission='view_auction')
     def get(self):
         """Retrieving the complaint
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': self.context.serialize("view")}
 
     @json_view(content_type="application/json", validators=(validate_patch_complaint_data,), permission='edit_complaint')
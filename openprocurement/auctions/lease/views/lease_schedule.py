@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from openprocurement.auctions.core.utils import (
+    APIResource,
+    json_view,
+    opresource,
+)
+
+from openprocurement.auctions.lease.lease_schedule import (
+    get_lease_amount,
+    get_lease_schedule,
+    rank_bids,
+)
+from openprocurement.auctions.lease.utils import (
+    get_decimal_param,
+    is_not_modified,
+)
+
+
+@opresource(name='propertyLease:Auction Lease Schedule',
+            path='/auctions/{auction_id}/lease_schedule',
+            auctionsprocurementMethodType="propertyLease",
+            description="Auction lease payment schedule")
+class AuctionLeaseScheduleResource(APIResource):
+
+    @json_view(permission='view_auction')
+    def get(self):
+        """Lease payment schedule
+
+        Monthly payments of the lease under the auction ``contractTerms``,
+        grouped in runs of equal payments. The base monthly amount is the
+        ``amount`` parameter, the value of the active award or the auction
+        value.
+
+        .. sourcecode:: http
+
+            GET /auctions/4879d3f8ee2443169b5fbbc9f89fa607/lease_schedule?amount=1000 HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 200 OK
+            Content-Type: application/json
+
+            {
+                "data": {
+                    "amount": 1000.0,
+                    "periods": 12,
+                    "total": 12600.0,
+                    "schedule": [
+                        {"startPeriod": 0, "endPeriod": 6, "amount": 1000.0, "total": 6000.0},
+                        {"startPeriod": 6, "endPeriod": 12, "amount": 1100.0, "total": 6600.0}
+                    ]
+                }
+            }
+
+        """
+        if is_not_modified(self.request):
+            return self.request.response
+        auction = self.request.validated['auction']
+        amount = get_decimal_param(self.request, 'amount')
+        if amount is None:
+            amount = get_lease_amount(auction)
+        schedule = get_lease_schedule(auction.contractTerms.leaseTerms.serialize())
+        return {'data': schedule.serialize(amount)}
+
+
+@opresource(name='propertyLease:Auction Bids Ranking',
+            path='/auctions/{auction_id}/bids_ranking',
+            auctionsprocurementMethodType="propertyLease",
+            description="Auction bids ranked by lease present value")
+class AuctionBidsRankingResource(APIResource):
+
+    @json_view(permission='view_auction')
+    def get(self):
+        """Bids ranked by lease present value
+
+        Values the active bids as monthly amounts of the lease under the
+        auction ``contractTerms``, discounted at the annual ``rate`` (0 by
+        default).
+
+        .. sourcecode:: http
+
+            GET /auctions/4879d3f8ee2443169b5fbbc9f89fa607/bids_ranking?rate=0.1 HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 200 OK
+            Content-Type: application/json
+
+            {
+                "data": [
+                    {
+                        "id": "4879d3f8ee2443169b5fbbc9f89fa607",
+                        "amount": 475.0,
+                        "presentValue": 35710.58
+                    }
+                ]
+            }
+
+        """
+        auction = self.request.validated['auction']
+        if self.request.validated['auction_status'] in ['active.tendering', 'active.auction']:
+            self.request.errors.add('body', 'data', 'Can\'t view bids in current ({}) auction status'.format(self.request.validated['auction_status']))
+            self.request.errors.status = 403
+            return
+        rate = get_decimal_param(self.request, 'rate', maximum=1) or 0
+        if is_not_modified(self.request):
+            return self.request.response
+        ranked = rank_bids(
+            auction.contractTerms.leaseTerms.serialize(),
+            [bid for bid in auction.bids if bid.status == 'active'],
+            rate
+        )
+        return {'data': [
+            {'id': bid.id, 'amount': bid.value.amount, 'presentValue': float(present_value)}
+            for present_value, bid in ranked
+        ]}
@@ -13,6 +13,10 @@ from openprocurement.auctions.core.validation import (
     validate_patch_lot_data,
 )
 
+from openprocurement.auctions.lease.utils import (
+    is_not_modified,
+)
+
 
 @opresource(name='propertyLease:Auction Lots',
             collection_path='/auctions/{auction_id}/lots',
@@ -45,12 +49,16 @@ class AuctionLotResource(APIResource):
     def collection_get(self):
         """Lots Listing
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': [i.serialize("view") for i in self.request.validated['auction'].lots]}
 
     @json_view(permission='view_auction')
     def get(self):
         """Retrieving the lot
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': self.request.context.serialize("view")}
 
     @json_view(content_type="application/json", validators=(validate_patch_lot_data,), permission='edit_auction')
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from cornice.resource import resource
+
+from openprocurement.auctions.core.traversal import Root
+from openprocurement.auctions.core.utils import (
+    APIResource,
+    error_handler,
+    json_view,
+)
+
+from openprocurement.auctions.lease.constants import PLANNING_PAGE_SIZE
+from openprocurement.auctions.lease.utils import (
+    get_listing_paging,
+    get_planning_window,
+    iter_auctions_planned_events,
+)
+
+
+@resource(name='propertyLease:Auctions Planning',
+          path='/auctions/lease/planning',
+          factory=Root,
+          error_handler=error_handler,
+          description="Upcoming transitions of lease auctions")
+class AuctionsPlanningResource(APIResource):
+
+    @json_view(permission='view_listing')
+    def get(self):
+        """Upcoming transitions of lease auctions
+
+        Lists the ``next_check``, tender period end, auction
+        ``shouldStartAfter`` and award complaint period end dates that fall
+        in a time window, ordered by date. ``since`` defaults to now and
+        ``till`` to one day after ``since``. Award complaint period ends are
+        listed while the auction is in qualification or awarded.
+
+        ``offset``/``limit`` select a page of at most 512 events and
+        ``next_page`` points to the next one. ``counts`` are those of the
+        whole window.
+
+        .. sourcecode:: http
+
+            GET /auctions/lease/planning?since=2014-11-06T00:00:00%2B02:00&till=2014-11-07T00:00:00%2B02:00 HTTP/1.1
+            Host: example.com
+            Accept: application/json
+
+        This is what one should expect in response:
+
+        .. sourcecode:: http
+
+            HTTP/1.1 200 OK
+            Content-Type: application/json
+
+            {
+                "data": [
+                    {
+                        "id": "64e93250be76435397e8c992ed4214d1",
+                        "event": "auctionPeriod.shouldStartAfter",
+                        "date": "2014-11-06T00:00:00+02:00",
+                        "status": "active.tendering",
+                        "relatedItem": null
+                    }
+                ],
+                "counts": {
+                    "auctionPeriod.shouldStartAfter": 1
+                },
+                "since": "2014-11-06T00:00:00+02:00",
+                "till": "2014-11-07T00:00:00+02:00"
+            }
+
+        """
+        window = get_planning_window(self.request)
+        paging = window and get_listing_paging(self.request)
+        if paging is None:
+            raise error_handler(self.request)
+        since, till = window
+        offset = paging['offset']
+        end = offset + min(paging['limit'] or PLANNING_PAGE_SIZE, PLANNING_PAGE_SIZE)
+        events = []
+        counts = {}
+        total = 0
+        for event in iter_auctions_planned_events(self.request.registry, since, till):
+            if offset <= total < end:
+                events.append(event)
+            total += 1
+            counts[event['event']] = counts.get(event['event'], 0) + 1
+        data = {
+            'data': events,
+            'counts': counts,
+            'since': since.isoformat(),
+            'till': till.isoformat(),
+        }
+        if end < total:
+            data['next_page'] = {'offset': end}
+        return data
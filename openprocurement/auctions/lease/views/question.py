@@ -13,6 +13,10 @@ from openprocurement.auctions.core.validation import (
     validate_patch_question_data,
 )
 
+from openprocurement.auctions.lease.utils import (
+    is_not_modified,
+)
+
 
 @opresource(name='propertyLease:Auction Questions',
             collection_path='/auctions/{auction_id}/questions',
@@ -48,12 +52,16 @@ class AuctionQuestionResource(APIResource):
     def collection_get(self):
         """List questions
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': [i.serialize(self.request.validated['auction'].status) for i in self.request.validated['auction'].questions]}
 
     @json_view(permission='view_auction')
     def get(self):
         """Retrieving the question
         """
+        if is_not_modified(self.request):
+            return self.request.response
         return {'data': self.request.validated['question'].serialize(self.request.validated['auction'].status)}
 
     @json_view(content_type="application/json", permission='edit_auction', validators=(validate_patch_question_data,))
@@ -13,9 +13,13 @@ from openprocurement.auctions.core.validation import (
 )
 
 from openprocurement.auctions.lease.utils import (
+    check_auction_updatable,
+    is_not_modified,
     check_status,
+    get_requested_fields,
     invalidate_bids_data,
-    append_additional_classificator
+    append_additional_classificator,
+    serialize_fields,
 )
 from openprocurement.auctions.lease.validation import (
     validate_rectification_period_editing,
@@ -114,11 +118,24 @@ class AuctionResource(APIResource):
                 }
             }
 
+        Only some fields can be requested with ``opt_fields``:
+
+        .. sourcecode:: http
+
+            GET /auctions/64e93250be76435397e8c992ed4214d1?opt_fields=status,next_check HTTP/1.1
+
         """
+        if is_not_modified(self.request):
+            return self.request.response
         if self.request.authenticated_role == 'chronograph':
-            auction_data = self.context.serialize('chronograph_view')
+            role = 'chronograph_view'
+        else:
+            role = self.context.status
+        fields = get_requested_fields(self.request)
+        if fields:
+            auction_data = serialize_fields(self.context, role, fields)
         else:
-            auction_data = self.context.serialize(self.context.status)
+            auction_data = self.context.serialize(role)
         return {'data': auction_data}
 
     #@json_view(content_type="application/json", validators=(validate_auction_data, ), permission='edit_auction')
@@ -182,9 +199,7 @@ class AuctionResource(APIResource):
 
         """
         auction = self.context
-        if self.request.authenticated_role != 'Administrator' and auction.status in ['complete', 'unsuccessful', 'cancelled']:
-            self.request.errors.add('body', 'data', 'Can\'t update auction in current ({}) status'.format(auction.status))
-            self.request.errors.status = 403
+        if not check_auction_updatable(self.request, auction):
             return
         if self.request.authenticated_role == 'chronograph':
             apply_patch(self.request, save=False, src=self.request.validated['auction_src'])
@@ -16,6 +16,9 @@ from openprocurement.auctions.core.validation import (
 )
 
 from openprocurement.auctions.lease.utils import (
+    documents_listing,
+    is_not_modified,
+    serialize_previous_versions,
     upload_file, get_file, invalidate_bids_data,
 )
 
@@ -45,14 +48,9 @@ class AuctionDocumentResource(APIResource):
     @json_view(permission='view_auction')
     def collection_get(self):
         """Auction Documents List"""
-        if self.request.params.get('all', ''):
-            collection_data = [i.serialize("view") for i in self.context.documents]
-        else:
-            collection_data = sorted(dict([
-                (i.id, i.serialize("view"))
-                for i in self.context.documents
-            ]).values(), key=lambda i: i['dateModified'])
-        return {'data': collection_data}
+        if is_not_modified(self.request):
+            return self.request.response
+        return documents_listing(self.request, self.context.documents)
 
     @json_view(permission='upload_auction_documents', validators=(validate_file_upload,))
     def collection_post(self):
@@ -82,13 +80,13 @@ class AuctionDocumentResource(APIResource):
         offline = bool(document.get('documentType') == 'x_dgfAssetFamiliarization')
         if self.request.params.get('download') and not offline:
             return get_file(self.request)
+        if is_not_modified(self.request):
+            return self.request.response
         document_data = document.serialize("view")
-        document_data['previousVersions'] = [
-            i.serialize("view")
-            for i in self.request.validated['documents']
-            if i.url != document.url or
-            (offline and i.dateModified != document.dateModified)
-        ]
+        document_data['previousVersions'] = serialize_previous_versions(
+            self.request, document, self.request.validated['auction'].documents,
+            lambda i: i.url != document.url or (offline and i.dateModified != document.dateModified)
+        )
         return {'data': document_data}
 
     @json_view(permission='upload_auction_documents', validators=(validate_file_update,))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+
+from openprocurement.api.constants import WORKING_DAYS
+from openprocurement.api.utils import set_specific_hour
+from openprocurement.auctions.core.utils import (
+    calculate_business_date as base_calculate_business_date,
+)
+
+# how many years around the known holidays are indexed
+CALENDAR_MARGIN_YEARS = 2
+
+
+def is_working_day(day, working_days=WORKING_DAYS):
+    iso_day = day.isoformat()
+    if day.weekday() in [5, 6]:
+        return not working_days.get(iso_day, True)
+    return not working_days.get(iso_day, False)
+
+
+class WorkingDaysCalendar(object):
+    """Sorted index of working day ordinals.
+
+    Replaces the day by day walk of calculate_business_date with a binary
+    search and a single jump over N working days.
+    """
+
+    def __init__(self, working_days=WORKING_DAYS, today=None):
+        years = [int(i[:4]) for i in working_days]
+        years.append((today or date.today()).year)
+        self.start = date(min(years) - CALENDAR_MARGIN_YEARS, 1, 1).toordinal()
+        self.end = date(max(years) + CALENDAR_MARGIN_YEARS + 1, 1, 1).toordinal()
+        self.ordinals = [
+            ordinal for ordinal in xrange(self.start, self.end)
+            if is_working_day(date.fromordinal(ordinal), working_days)
+        ]
+
+    def __contains__(self, day):
+        ordinal = day.toordinal()
+        index = bisect_left(self.ordinals, ordinal)
+        return index < len(self.ordinals) and self.ordinals[index] == ordinal
+
+    def shift(self, date_obj, timedelta_obj):
+        """Move date_obj by timedelta_obj.days working days.
+
+        Mirrors the semantics of the core calculate_business_date: a
+        non-working start day is first moved to a midnight border, the time
+        of day is kept otherwise. Returns None when the result falls out of
+        the indexed range.
+        """
+        ordinal = date_obj.toordinal()
+        if not self.start < ordinal < self.end - 1:
+            return
+        forward = timedelta_obj > timedelta()
+        days = abs(timedelta_obj.days)
+        index = bisect_left(self.ordinals, ordinal)
+        working = index < len(self.ordinals) and self.ordinals[index] == ordinal
+        if not working:
+            date_obj = datetime.combine(date_obj.date(), time(0, tzinfo=date_obj.tzinfo))
+            if not forward and not days:
+                return date_obj - timedelta(ordinal - self.ordinals[index - 1] - 1)
+        target = index + days if forward else index - days
+        if not 0 <= target < len(self.ordinals):
+            return
+        return date_obj + timedelta(self.ordinals[target] - ordinal)
+
+
+_calendar = None
+
+
+def init_working_days_calendar(working_days=WORKING_DAYS):
+    global _calendar
+    _calendar = WorkingDaysCalendar(working_days)
+    return _calendar
+
+
+def get_working_days_calendar():
+    return _calendar or init_working_days_calendar()
+
+
+def has_procurement_method_details(context):
+    # acceleration is configured through procurementMethodDetails and is
+    # left to the core implementation
+    return bool(context and 'procurementMethodDetails' in context and context['procurementMethodDetails'])
+
+
+def calculate_business_date(date_obj, timedelta_obj, context=None, working_days=False, specific_hour=None):
+    """calculate_business_date backed by the working days calendar index"""
+    if working_days and not has_procurement_method_details(context):
+        result = get_working_days_calendar().shift(date_obj, timedelta_obj)
+        if result is not None:
+            if specific_hour:
+                result = set_specific_hour(result, specific_hour)
+            return result
+    return base_calculate_business_date(date_obj, timedelta_obj, context, working_days=working_days, specific_hour=specific_hour)